@@ -5,161 +5,484 @@ Uses computer vision to identify crop diseases, assess severity, and provide tre
 """
 
 import numpy as np
-import pandas as pd
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 import random
-from PIL import Image
-import io
+from bisect import bisect
+from itertools import accumulate
+
+# Disease database with comprehensive information
+DISEASE_DATABASE = {
+    'leaf_spot': {
+        'name': 'Leaf Spot Disease',
+        'crops_affected': ['Rice', 'Wheat', 'Cotton', 'Tomato', 'Potato'],
+        'symptoms': ['Brown/black spots on leaves', 'Yellowing around spots', 'Premature leaf drop'],
+        'causes': ['Fungal infection', 'High humidity', 'Poor air circulation'],
+        'severity_indicators': {
+            'mild': 'Few scattered spots (1-5% leaf area)',
+            'moderate': 'Multiple spots covering 5-25% leaf area',
+            'severe': 'Extensive spotting >25% leaf area, leaf yellowing'
+        },
+        'treatments': {
+            'mild': ['Copper-based fungicide spray', 'Improve air circulation', 'Remove affected leaves'],
+            'moderate': ['Systemic fungicide (Propiconazole)', 'Weekly spraying for 3 weeks', 'Reduce irrigation frequency'],
+            'severe': ['Immediate fungicide treatment', 'Remove severely affected plants', 'Soil treatment with beneficial microbes']
+        },
+        'prevention': [
+            'Crop rotation with non-host crops',
+            'Proper spacing for air circulation',
+            'Avoid overhead irrigation',
+            'Regular field sanitation',
+            'Use resistant varieties'
+        ],
+        'cost_estimate': {'mild': 500, 'moderate': 1500, 'severe': 3000}
+    },
+
+    'bacterial_blight': {
+        'name': 'Bacterial Blight',
+        'crops_affected': ['Rice', 'Cotton', 'Beans', 'Citrus'],
+        'symptoms': ['Water-soaked lesions', 'Yellow halos around spots', 'Wilting of leaves'],
+        'causes': ['Bacterial infection', 'Wounds from insects/tools', 'Wet conditions'],
+        'severity_indicators': {
+            'mild': 'Few lesions on lower leaves',
+            'moderate': 'Spread to middle leaves, some yellowing',
+            'severe': 'Extensive wilting, plant death possible'
+        },
+        'treatments': {
+            'mild': ['Copper hydroxide spray', 'Remove infected debris', 'Improve drainage'],
+            'moderate': ['Streptomycin antibiotic', 'Copper-based bactericide', 'Enhanced sanitation'],
+            'severe': ['Immediate plant removal', 'Soil sterilization', 'Quarantine affected area']
+        },
+        'prevention': [
+            'Use certified disease-free seeds',
+            'Sterilize tools between plants',
+            'Avoid working in wet conditions',
+            'Control insect vectors',
+            'Proper field drainage'
+        ],
+        'cost_estimate': {'mild': 800, 'moderate': 2000, 'severe': 4000}
+    },
+
+    'powdery_mildew': {
+        'name': 'Powdery Mildew',
+        'crops_affected': ['Wheat', 'Barley', 'Cotton', 'Grapes', 'Cucumber'],
+        'symptoms': ['White powdery coating on leaves', 'Stunted growth', 'Reduced yield'],
+        'causes': ['Fungal spores', 'High humidity with dry conditions', 'Poor air circulation'],
+        'severity_indicators': {
+            'mild': 'Light dusting on few leaves',
+            'moderate': 'Moderate coverage on 10-30% of plant',
+            'severe': 'Heavy white coating, leaf distortion'
+        },
+        'treatments': {
+            'mild': ['Sulfur-based spray', 'Baking soda solution (1%)', 'Improve air flow'],
+            'moderate': ['Systemic fungicide (Myclobutanil)', 'Weekly applications', 'Remove infected leaves'],
+            'severe': ['Triazole fungicides', 'Destroy heavily infected plants', 'Soil treatment']
+        },
+        'prevention': [
+            'Plant resistant varieties',
+            'Ensure proper plant spacing',
+            'Avoid late evening irrigation',
+            'Regular monitoring',
+            'Balanced fertilization'
+        ],
+        'cost_estimate': {'mild': 400, 'moderate': 1200, 'severe': 2500}
+    },
+
+    'rust_disease': {
+        'name': 'Rust Disease',
+        'crops_affected': ['Wheat', 'Corn', 'Coffee', 'Beans'],
+        'symptoms': ['Orange/brown pustules on leaves', 'Yellowing leaves', 'Reduced photosynthesis'],
+        'causes': ['Rust fungi', 'Moderate temperatures', 'High moisture'],
+        'severity_indicators': {
+            'mild': 'Few pustules on lower leaves',
+            'moderate': 'Pustules on middle leaves, some yellowing',
+            'severe': 'Extensive pustules, significant yellowing'
+        },
+        'treatments': {
+            'mild': ['Preventive fungicide spray', 'Remove infected leaves', 'Monitor spread'],
+            'moderate': ['Triazole fungicides', 'Bi-weekly applications', 'Enhanced monitoring'],
+            'severe': ['Emergency fungicide program', 'Consider replanting', 'Quarantine measures']
+        },
+        'prevention': [
+            'Use rust-resistant varieties',
+            'Timely planting',
+            'Proper field sanitation',
+            'Monitor weather conditions',
+            'Balanced nutrition'
+        ],
+        'cost_estimate': {'mild': 600, 'moderate': 1800, 'severe': 3500}
+    },
+
+    'viral_mosaic': {
+        'name': 'Viral Mosaic',
+        'crops_affected': ['Tobacco', 'Tomato', 'Cucumber', 'Pepper'],
+        'symptoms': ['Mosaic pattern on leaves', 'Stunted growth', 'Malformed fruits'],
+        'causes': ['Viral infection', 'Insect vectors (aphids)', 'Contaminated tools'],
+        'severity_indicators': {
+            'mild': 'Light mosaic on few leaves',
+            'moderate': 'Visible mosaic, slight stunting',
+            'severe': 'Severe mosaic, significant stunting'
+        },
+        'treatments': {
+            'mild': ['Remove infected plants', 'Control insect vectors', 'Tool sterilization'],
+            'moderate': ['Intensive vector control', 'Quarantine affected area', 'Remove all infected plants'],
+            'severe': ['Destroy entire crop if >30% infected', 'Soil treatment', 'Extended quarantine']
+        },
+        'prevention': [
+            'Use virus-free seeds/seedlings',
+            'Control aphid populations',
+            'Sterilize tools between plants',
+            'Remove weed hosts',
+            'Use reflective mulches'
+        ],
+        'cost_estimate': {'mild': 1000, 'moderate': 2500, 'severe': 5000}
+    }
+}
+
+# Nutrient deficiency symptoms (often confused with diseases)
+NUTRIENT_DEFICIENCIES = {
+    'nitrogen_deficiency': {
+        'name': 'Nitrogen Deficiency',
+        'symptoms': ['Yellowing of older leaves', 'Stunted growth', 'Poor yield'],
+        'treatment': 'Apply nitrogen fertilizer (Urea 20-30 kg/acre)',
+        'cost': 800
+    },
+    'potassium_deficiency': {
+        'name': 'Potassium Deficiency', 
+        'symptoms': ['Brown leaf edges', 'Weak stems', 'Poor fruit quality'],
+        'treatment': 'Apply potassium fertilizer (MOP 15-20 kg/acre)',
+        'cost': 600
+    }
+}
+
+# Generic prevention strategies
+GENERAL_PREVENTION_STRATEGIES = (
+    '🌱 **Seed Selection**: Use certified, disease-resistant varieties',
+    '🚰 **Water Management**: Implement proper irrigation scheduling', 
+    '🧹 **Field Sanitation**: Remove crop debris and weeds regularly',
+    '🔄 **Crop Rotation**: Follow 2-3 year rotation with non-host crops',
+    '⚖️ **Balanced Nutrition**: Maintain optimal NPK levels',
+    '🔍 **Regular Monitoring**: Weekly field inspections for early detection',
+    '🛡️ **Integrated Pest Management**: Use biological and chemical controls wisely',
+    '📅 **Timely Operations**: Follow recommended planting and harvesting schedules'
+)
+
+# Crop-specific strategies
+CROP_PREVENTION_STRATEGIES = {
+    'Rice': (
+        '💧 Maintain proper water levels in fields',
+        '🌾 Use short-duration varieties in disease-prone areas',
+        '🦆 Consider duck farming for integrated pest control'
+    ),
+    'Wheat': (
+        '❄️ Follow recommended sowing dates to avoid rust',
+        '💨 Ensure proper air circulation between plants',
+        '🌡️ Monitor weather for rust-favorable conditions'
+    ),
+    'Cotton': (
+        '🐛 Implement bollworm management strategies',
+        '🌿 Use trap crops around main cotton fields',
+        '💧 Avoid water stress during flowering'
+    )
+}
+
+# Seasonal disease management calendar
+SEASONAL_CALENDAR = {
+    'Pre-Planting (15-30 days before)': (
+        'Soil treatment with beneficial microbes',
+        'Field preparation and debris removal',
+        'Seed treatment with fungicides'
+    ),
+    'Planting Stage (0-15 days)': (
+        'Use certified disease-free seeds',
+        'Optimal spacing for air circulation',
+        'Soil moisture management'
+    ),
+    'Vegetative Stage (15-45 days)': (
+        'Weekly disease monitoring',
+        'Balanced fertilizer application',
+        'Preventive fungicide sprays if needed'
+    ),
+    'Reproductive Stage (45-75 days)': (
+        'Intensive monitoring for diseases',
+        'Water stress management',
+        'Targeted disease control measures'
+    ),
+    'Maturity & Harvest (75+ days)': (
+        'Pre-harvest disease assessment',
+        'Proper harvesting techniques',
+        'Post-harvest field sanitation'
+    )
+}
+
+# Weekly monitoring checklist
+MONITORING_CHECKLIST = (
+    '👀 **Visual Inspection**: Check for spots, lesions, or unusual coloration',
+    '🍃 **Leaf Health**: Examine both upper and lower leaf surfaces',
+    '🌿 **Plant Vigor**: Assess overall plant health and growth',
+    '💧 **Moisture Conditions**: Check soil moisture and drainage',
+    '🌡️ **Weather Monitoring**: Track temperature and humidity',
+    '📸 **Photo Documentation**: Record suspicious symptoms',
+    '📝 **Record Keeping**: Document findings and actions taken',
+    '🔄 **Treatment Follow-up**: Monitor effectiveness of treatments'
+)
+
+# General recommendations attached to every analysis report
+HEALTHY_RECOMMENDATIONS = (
+    'Continue regular monitoring',
+    'Maintain proper irrigation schedule',
+    'Ensure adequate nutrition',
+    'Practice good field hygiene'
+)
+
+DISEASE_RECOMMENDATIONS = (
+    'Monitor weather conditions closely',
+    'Consider preventive treatments for healthy plants',
+    'Document disease progression with photos',
+    'Consult local agricultural extension officer'
+)
+
+SEVERE_DISEASE_RECOMMENDATIONS = ('Immediate action required - treat within 24 hours',) + DISEASE_RECOMMENDATIONS
+
+# Expert consultation request content
+EXPERT_QUESTIONS = (
+    'Please confirm the disease identification',
+    'Are the recommended treatments appropriate?',
+    'Any additional management strategies needed?',
+    'Prevention measures for future crops?'
+)
+
+EXPERT_TYPES = ('Plant Pathologist', 'Agricultural Extension Officer')
+
+# Canonical crop names for the disease tables, keyed by casefolded name or alias
+CROP_ALIASES = {
+    'rice': 'Rice',
+    'paddy': 'Rice',
+    'wheat': 'Wheat',
+    'cotton': 'Cotton',
+    'cotton(lint)': 'Cotton',
+    'tomato': 'Tomato',
+    'potato': 'Potato',
+    'corn': 'Corn',
+    'maize': 'Corn'
+}
+
+# Simulated diseases per crop as (disease_id, name, base probability),
+# listed from most to least likely
+SIMULATED_CROP_DISEASES = {
+    'Rice': (
+        ('leaf_spot', 'Brown Leaf Spot', 0.25),
+        ('bacterial_blight', 'Bacterial Leaf Blight', 0.20),
+        ('blast_disease', 'Rice Blast', 0.15),
+        ('sheath_rot', 'Sheath Rot', 0.10)
+    ),
+    'Wheat': (
+        ('rust_disease', 'Yellow Rust', 0.30),
+        ('powdery_mildew', 'Powdery Mildew', 0.25),
+        ('leaf_spot', 'Leaf Spot', 0.20),
+        ('fusarium_head', 'Fusarium Head Blight', 0.15)
+    ),
+    'Cotton': (
+        ('bacterial_blight', 'Bacterial Blight', 0.25),
+        ('leaf_spot', 'Leaf Spot', 0.20),
+        ('verticillium_wilt', 'Verticillium Wilt', 0.18),
+        ('bollworm', 'Bollworm Damage', 0.15)
+    ),
+    'Tomato': (
+        ('late_blight', 'Late Blight', 0.30),
+        ('early_blight', 'Early Blight', 0.25),
+        ('leaf_spot', 'Septoria Leaf Spot', 0.20),
+        ('viral_mosaic', 'Mosaic Virus', 0.15)
+    ),
+    'Potato': (
+        ('late_blight', 'Late Blight', 0.35),
+        ('early_blight', 'Early Blight', 0.25),
+        ('scab', 'Common Scab', 0.15),
+        ('black_scurf', 'Black Scurf', 0.10)
+    ),
+    'Corn': (
+        ('corn_rust', 'Common Rust', 0.30),
+        ('leaf_blight', 'Northern Corn Leaf Blight', 0.25),
+        ('gray_leaf_spot', 'Gray Leaf Spot', 0.20),
+        ('smut', 'Common Smut', 0.10)
+    )
+}
+
+# Fallback for crops without a specific disease profile
+DEFAULT_SIMULATED_DISEASES = (
+    ('leaf_spot', 'General Leaf Spot', 0.30),
+    ('fungal_infection', 'Fungal Infection', 0.25),
+    ('bacterial_disease', 'Bacterial Disease', 0.20)
+)
+
+# Common diseases by crop type
+CROP_DISEASE_MAP = {
+    'Rice': ('leaf_spot', 'bacterial_blight'),
+    'Wheat': ('rust_disease', 'powdery_mildew', 'leaf_spot'),
+    'Cotton': ('bacterial_blight', 'leaf_spot'),
+    'Tomato': ('leaf_spot', 'bacterial_blight', 'viral_mosaic'),
+    'Potato': ('leaf_spot',),
+    'Corn': ('rust_disease',),
+    'Unknown': ('leaf_spot', 'powdery_mildew')
+}
+
+# Symptom descriptions by disease and severity
+DISEASE_DESCRIPTIONS = {
+    'leaf_spot': {
+        'mild': 'Small brown spots visible on few leaves',
+        'moderate': 'Multiple brown spots with yellow halos on several leaves',
+        'severe': 'Extensive spotting with leaf yellowing and drop'
+    },
+    'bacterial_blight': {
+        'mild': 'Water-soaked lesions on leaf edges',
+        'moderate': 'Expanding lesions with bacterial ooze',
+        'severe': 'Widespread leaf necrosis and plant wilting'
+    },
+    'rust_disease': {
+        'mild': 'Small orange pustules on leaf surface',
+        'moderate': 'Numerous rust pustules covering leaves',
+        'severe': 'Severe rust infection causing leaf death'
+    }
+}
+
+# Base treatment cost per disease, scaled by severity
+TREATMENT_BASE_COSTS = {
+    'leaf_spot': 800,
+    'bacterial_blight': 1200,
+    'rust_disease': 1000,
+    'powdery_mildew': 600,
+    'late_blight': 1500,
+    'early_blight': 900
+}
+
+SEVERITY_COST_MULTIPLIERS = {
+    'mild': 0.8,
+    'moderate': 1.0,
+    'severe': 1.5
+}
+
+# Severity ordering; unrecognised labels rank as mild (see _severity_rank)
+SEVERITY_RANK = {'mild': 1, 'moderate': 2, 'severe': 3}
+URGENCY_LEVELS = ('Low', 'Medium', 'High')
+
+# Season by calendar month (January first): monsoon is June-September,
+# post-monsoon/winter is October-January and the rest is summer
+MONTH_TO_SEASON = ('Winter',) + ('Summer',) * 4 + ('Monsoon',) * 4 + ('Winter',) * 3
+
+SEASON_RISK_FACTORS = {
+    'Monsoon': ('High humidity', 'Excessive moisture', 'Poor drainage'),
+    'Winter': ('Temperature fluctuation', 'Dew formation'),
+    'Summer': ('Heat stress', 'Drought conditions')
+}
+
+# Environmental summary templates by season and risk level; only the
+# selected one is formatted with the location
+ENVIRONMENTAL_SUMMARIES = {
+    'Monsoon': {
+        'High': "High disease risk due to monsoon conditions in {location}. Monitor closely for fungal diseases.",
+        'Medium': "Moderate risk during monsoon season in {location}. Maintain preventive measures.",
+        'Low': "Lower risk despite monsoon - good drainage in {location} helps."
+    },
+    'Winter': {
+        'High': "Winter conditions in {location} favor certain diseases. Watch for frost damage.",
+        'Medium': "Moderate winter risk in {location}. Temperature variations may stress plants.",
+        'Low': "Low disease risk during winter in {location}. Good season for crop health."
+    },
+    'Summer': {
+        'High': "High heat stress risk in {location}. Ensure adequate irrigation.",
+        'Medium': "Moderate summer stress in {location}. Monitor water requirements.",
+        'Low': "Manageable summer conditions in {location}. Maintain regular care."
+    }
+}
+
+# Weighted outcomes for the simulations, stored with cumulative weights so a
+# draw is a single bisect instead of a random.choices call
+SEVERITY_LEVELS = ('mild', 'moderate', 'severe')
+SEVERITY_CDF = tuple(accumulate((50, 35, 15)))  # Most diseases are mild to moderate
+SIMULATED_DISEASE_COUNTS = (1, 2)
+SIMULATED_DISEASE_COUNT_CDF = tuple(accumulate((75, 25)))  # Mostly 1 disease
+BASIC_DISEASE_COUNTS = (0, 1, 2)
+BASIC_DISEASE_COUNT_CDF = tuple(accumulate((10, 70, 20)))
+QUALITY_TABLE = (
+    ('Excellent', 'Perfect lighting and focus for accurate analysis'),
+    ('Good', 'Good image quality, analysis highly reliable'),
+    ('Fair', 'Acceptable quality, consider retaking in better light'),
+    ('Poor', 'Poor image quality may affect accuracy - please retake')
+)
+QUALITY_CDF = tuple(accumulate((20, 50, 25, 5)))
+RISK_LEVELS = ('Low', 'Medium', 'High')
+RISK_LEVEL_CDF = tuple(accumulate((30, 50, 20)))  # Default distribution
+HIGH_RISK_LEVEL_CDF = tuple(accumulate((15, 35, 50)))
+LOW_RISK_LEVEL_CDF = tuple(accumulate((50, 35, 15)))
+
+# Column view of the disease database for scans across all diseases;
+# DISEASE_COSTS has one row per disease and one column per severity level
+DISEASE_IDS = tuple(DISEASE_DATABASE)
+DISEASE_NAMES = tuple(disease['name'] for disease in DISEASE_DATABASE.values())
+DISEASE_COSTS = np.array(
+    [[disease['cost_estimate'][level] for level in SEVERITY_LEVELS] for disease in DISEASE_DATABASE.values()],
+    dtype=np.int32
+)
+
+# Expected treatment duration by severity
+TREATMENT_TIMELINES = {
+    'mild': '1-2 weeks',
+    'moderate': '2-4 weeks',
+    'severe': '4-6 weeks'
+}
+
+# Expected treatment success rate ranges (%) by severity
+SUCCESS_RATE_RANGES = {
+    'mild': (85, 95),
+    'moderate': (70, 85),
+    'severe': (50, 70)
+}
+
+
+def _severity_rank(label):
+    """Rank a severity label, treating unrecognised labels as mild."""
+    return SEVERITY_RANK.get(label, SEVERITY_RANK['mild'])
+
+
+def _canonical_crop(crop_type):
+    """Map a user or dataset crop name onto the names used by the crop tables."""
+    return CROP_ALIASES.get(crop_type.strip().casefold(), crop_type)
+
+
+@lru_cache(maxsize=128)
+def _static_treatment_plan(disease_id, severity):
+    """Deterministic part of a treatment plan for a known disease.
+    
+    The cached plan is shared by every caller, so it is read-only and holds
+    tuples rather than the database's own lists.
+    """
+    disease = DISEASE_DATABASE[disease_id]
+    treatments = tuple(disease['treatments'].get(severity, disease['treatments']['mild']))
+    return MappingProxyType({
+        'immediate_actions': treatments[:2],
+        'treatments': treatments,
+        'timeline': TREATMENT_TIMELINES.get(severity, '2-3 weeks'),
+        'cost_estimate': disease['cost_estimate'].get(severity, 500)
+    })
+
 
 class CropDiseaseDetector:
     """AI-powered crop disease detection and treatment recommendation system."""
     
-    def __init__(self, data_loader=None):
+    __slots__ = ('data_loader', 'disease_database', 'nutrient_deficiencies', '_rng')
+    
+    def __init__(self, data_loader=None, seed=None):
         self.data_loader = data_loader
+        self.disease_database = DISEASE_DATABASE
+        self.nutrient_deficiencies = NUTRIENT_DEFICIENCIES
         
-        # Disease database with comprehensive information
-        self.disease_database = {
-            'leaf_spot': {
-                'name': 'Leaf Spot Disease',
-                'crops_affected': ['Rice', 'Wheat', 'Cotton', 'Tomato', 'Potato'],
-                'symptoms': ['Brown/black spots on leaves', 'Yellowing around spots', 'Premature leaf drop'],
-                'causes': ['Fungal infection', 'High humidity', 'Poor air circulation'],
-                'severity_indicators': {
-                    'mild': 'Few scattered spots (1-5% leaf area)',
-                    'moderate': 'Multiple spots covering 5-25% leaf area',
-                    'severe': 'Extensive spotting >25% leaf area, leaf yellowing'
-                },
-                'treatments': {
-                    'mild': ['Copper-based fungicide spray', 'Improve air circulation', 'Remove affected leaves'],
-                    'moderate': ['Systemic fungicide (Propiconazole)', 'Weekly spraying for 3 weeks', 'Reduce irrigation frequency'],
-                    'severe': ['Immediate fungicide treatment', 'Remove severely affected plants', 'Soil treatment with beneficial microbes']
-                },
-                'prevention': [
-                    'Crop rotation with non-host crops',
-                    'Proper spacing for air circulation',
-                    'Avoid overhead irrigation',
-                    'Regular field sanitation',
-                    'Use resistant varieties'
-                ],
-                'cost_estimate': {'mild': 500, 'moderate': 1500, 'severe': 3000}
-            },
-            
-            'bacterial_blight': {
-                'name': 'Bacterial Blight',
-                'crops_affected': ['Rice', 'Cotton', 'Beans', 'Citrus'],
-                'symptoms': ['Water-soaked lesions', 'Yellow halos around spots', 'Wilting of leaves'],
-                'causes': ['Bacterial infection', 'Wounds from insects/tools', 'Wet conditions'],
-                'severity_indicators': {
-                    'mild': 'Few lesions on lower leaves',
-                    'moderate': 'Spread to middle leaves, some yellowing',
-                    'severe': 'Extensive wilting, plant death possible'
-                },
-                'treatments': {
-                    'mild': ['Copper hydroxide spray', 'Remove infected debris', 'Improve drainage'],
-                    'moderate': ['Streptomycin antibiotic', 'Copper-based bactericide', 'Enhanced sanitation'],
-                    'severe': ['Immediate plant removal', 'Soil sterilization', 'Quarantine affected area']
-                },
-                'prevention': [
-                    'Use certified disease-free seeds',
-                    'Sterilize tools between plants',
-                    'Avoid working in wet conditions',
-                    'Control insect vectors',
-                    'Proper field drainage'
-                ],
-                'cost_estimate': {'mild': 800, 'moderate': 2000, 'severe': 4000}
-            },
-            
-            'powdery_mildew': {
-                'name': 'Powdery Mildew',
-                'crops_affected': ['Wheat', 'Barley', 'Cotton', 'Grapes', 'Cucumber'],
-                'symptoms': ['White powdery coating on leaves', 'Stunted growth', 'Reduced yield'],
-                'causes': ['Fungal spores', 'High humidity with dry conditions', 'Poor air circulation'],
-                'severity_indicators': {
-                    'mild': 'Light dusting on few leaves',
-                    'moderate': 'Moderate coverage on 10-30% of plant',
-                    'severe': 'Heavy white coating, leaf distortion'
-                },
-                'treatments': {
-                    'mild': ['Sulfur-based spray', 'Baking soda solution (1%)', 'Improve air flow'],
-                    'moderate': ['Systemic fungicide (Myclobutanil)', 'Weekly applications', 'Remove infected leaves'],
-                    'severe': ['Triazole fungicides', 'Destroy heavily infected plants', 'Soil treatment']
-                },
-                'prevention': [
-                    'Plant resistant varieties',
-                    'Ensure proper plant spacing',
-                    'Avoid late evening irrigation',
-                    'Regular monitoring',
-                    'Balanced fertilization'
-                ],
-                'cost_estimate': {'mild': 400, 'moderate': 1200, 'severe': 2500}
-            },
-            
-            'rust_disease': {
-                'name': 'Rust Disease',
-                'crops_affected': ['Wheat', 'Corn', 'Coffee', 'Beans'],
-                'symptoms': ['Orange/brown pustules on leaves', 'Yellowing leaves', 'Reduced photosynthesis'],
-                'causes': ['Rust fungi', 'Moderate temperatures', 'High moisture'],
-                'severity_indicators': {
-                    'mild': 'Few pustules on lower leaves',
-                    'moderate': 'Pustules on middle leaves, some yellowing',
-                    'severe': 'Extensive pustules, significant yellowing'
-                },
-                'treatments': {
-                    'mild': ['Preventive fungicide spray', 'Remove infected leaves', 'Monitor spread'],
-                    'moderate': ['Triazole fungicides', 'Bi-weekly applications', 'Enhanced monitoring'],
-                    'severe': ['Emergency fungicide program', 'Consider replanting', 'Quarantine measures']
-                },
-                'prevention': [
-                    'Use rust-resistant varieties',
-                    'Timely planting',
-                    'Proper field sanitation',
-                    'Monitor weather conditions',
-                    'Balanced nutrition'
-                ],
-                'cost_estimate': {'mild': 600, 'moderate': 1800, 'severe': 3500}
-            },
-            
-            'viral_mosaic': {
-                'name': 'Viral Mosaic',
-                'crops_affected': ['Tobacco', 'Tomato', 'Cucumber', 'Pepper'],
-                'symptoms': ['Mosaic pattern on leaves', 'Stunted growth', 'Malformed fruits'],
-                'causes': ['Viral infection', 'Insect vectors (aphids)', 'Contaminated tools'],
-                'severity_indicators': {
-                    'mild': 'Light mosaic on few leaves',
-                    'moderate': 'Visible mosaic, slight stunting',
-                    'severe': 'Severe mosaic, significant stunting'
-                },
-                'treatments': {
-                    'mild': ['Remove infected plants', 'Control insect vectors', 'Tool sterilization'],
-                    'moderate': ['Intensive vector control', 'Quarantine affected area', 'Remove all infected plants'],
-                    'severe': ['Destroy entire crop if >30% infected', 'Soil treatment', 'Extended quarantine']
-                },
-                'prevention': [
-                    'Use virus-free seeds/seedlings',
-                    'Control aphid populations',
-                    'Sterilize tools between plants',
-                    'Remove weed hosts',
-                    'Use reflective mulches'
-                ],
-                'cost_estimate': {'mild': 1000, 'moderate': 2500, 'severe': 5000}
-            }
-        }
-        
-        # Nutrient deficiency symptoms (often confused with diseases)
-        self.nutrient_deficiencies = {
-            'nitrogen_deficiency': {
-                'name': 'Nitrogen Deficiency',
-                'symptoms': ['Yellowing of older leaves', 'Stunted growth', 'Poor yield'],
-                'treatment': 'Apply nitrogen fertilizer (Urea 20-30 kg/acre)',
-                'cost': 800
-            },
-            'potassium_deficiency': {
-                'name': 'Potassium Deficiency', 
-                'symptoms': ['Brown leaf edges', 'Weak stems', 'Poor fruit quality'],
-                'treatment': 'Apply potassium fertilizer (MOP 15-20 kg/acre)',
-                'cost': 600
-            }
-        }
+        # Private generator so simulations don't share the global random state
+        self._rng = random.Random(seed)
+    
+    def _weighted_choice(self, options, cdf):
+        """Pick one option using precomputed cumulative weights."""
+        return options[bisect(cdf, self._rng.random() * cdf[-1], 0, len(cdf) - 1)]
     
     def aggregate_multi_photo_analysis(self, analyses):
         """Aggregate results from multiple photo analyses for better accuracy."""
@@ -181,9 +504,8 @@ class CropDiseaseDetector:
                         all_diseases[disease_id]['confidence'] + disease['confidence']
                     ) / 2
                     # Take highest severity
-                    severity_order = {'mild': 1, 'moderate': 2, 'severe': 3}
-                    current_severity = severity_order.get(all_diseases[disease_id]['severity'], 0)
-                    new_severity = severity_order.get(disease['severity'], 0)
+                    current_severity = _severity_rank(all_diseases[disease_id]['severity'])
+                    new_severity = _severity_rank(disease['severity'])
                     if new_severity > current_severity:
                         all_diseases[disease_id]['severity'] = disease['severity']
                 else:
@@ -204,6 +526,19 @@ class CropDiseaseDetector:
         
         return base_analysis
     
+    def get_treatment_cost_overview(self):
+        """Summarize treatment cost ranges across all known diseases for each severity."""
+        low, average, high = DISEASE_COSTS.min(axis=0), DISEASE_COSTS.mean(axis=0), DISEASE_COSTS.max(axis=0)
+        return {
+            level: {
+                'min': int(low[i]),
+                'average': round(float(average[i])),
+                'max': int(high[i]),
+                'most_expensive': DISEASE_NAMES[int(DISEASE_COSTS[:, i].argmax())]
+            }
+            for i, level in enumerate(SEVERITY_LEVELS)
+        }
+    
     def get_enhanced_treatment_plan(self, disease_id, severity, crop_type, location=None):
         """Get enhanced treatment plan with location-specific recommendations."""
         
@@ -214,10 +549,11 @@ class CropDiseaseDetector:
                 'cost_estimate': 1000
             }
         
+        # Copies, so callers editing their plan can't touch the shared database
         disease_info = self.disease_database[disease_id]
         treatment_plan = {
-            'immediate_actions': disease_info['treatments'].get(severity, disease_info['treatments']['mild']),
-            'prevention': disease_info['prevention'],
+            'immediate_actions': list(disease_info['treatments'].get(severity, disease_info['treatments']['mild'])),
+            'prevention': list(disease_info['prevention']),
             'cost_estimate': disease_info['cost_estimate'].get(severity, 1000)
         }
         
@@ -252,11 +588,20 @@ class CropDiseaseDetector:
         Enhanced AI analysis of crop disease image with realistic simulation and image validation.
         Only analyzes images that actually contain crops/plants.
         """
-        
-        # Simulate image processing time
-        import time
-        time.sleep(1.5)
-        
+        return self.analyze_images([image_data], crop_type, location)[0]
+    
+    def analyze_images(self, images, crop_type="Unknown", location="Unknown"):
+        """
+        Analyze several photos of the same crop in one call.
+        The timestamp and environmental assessment are shared by the whole batch.
+        """
+        timestamp = datetime.now().isoformat(sep=' ', timespec='seconds')
+        shared = {}
+        return [self._analyze_single_image(image_data, crop_type, location, timestamp, shared)
+                for image_data in images]
+    
+    def _analyze_single_image(self, image_data, crop_type, location, timestamp, shared):
+        """Validate one image and build its analysis report."""
         # Analyze actual image properties and validate if it contains crops
         try:
             from PIL import Image
@@ -270,7 +615,7 @@ class CropDiseaseDetector:
             if not is_crop_image:
                 # Return validation failure result instead of disease prediction
                 return {
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'timestamp': timestamp,
                     'crop_type': crop_type,
                     'location': location,
                     'image_validation': validation_result,
@@ -288,7 +633,7 @@ class CropDiseaseDetector:
         except Exception as e:
             # Return error for invalid image files
             return {
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'timestamp': timestamp,
                 'crop_type': crop_type,
                 'location': location,
                 'is_valid_crop_image': False,
@@ -296,9 +641,13 @@ class CropDiseaseDetector:
                 'suggestions': ["Please upload a clear image in JPG, PNG, or JPEG format", "Ensure the image file is not corrupted"]
             }
         
+        # Seasonal/location risk is the same for every photo in a batch
+        if 'environmental_factors' not in shared:
+            shared['environmental_factors'] = self._assess_environmental_risk(crop_type, location)
+        
         # Generate comprehensive analysis report with enhanced data
         analysis_report = {
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'timestamp': timestamp,
             'crop_type': crop_type,
             'location': location,
             'image_quality': image_quality,
@@ -306,7 +655,7 @@ class CropDiseaseDetector:
             'is_valid_crop_image': True,
             'diseases_detected': detected_diseases,
             'confidence_score': self._calculate_overall_confidence(detected_diseases, image_quality),
-            'environmental_factors': self._assess_environmental_risk(crop_type, location),
+            'environmental_factors': shared['environmental_factors'],
             'urgency_level': self._calculate_urgency(detected_diseases),
             'analysis_method': 'Enhanced AI Simulation with Image Validation',
             'recommendations': self._generate_general_recommendations(crop_type, detected_diseases)
@@ -320,8 +669,6 @@ class CropDiseaseDetector:
         Uses multiple strict validation layers with weighted scoring.
         Returns (is_valid, validation_details)
         """
-        import numpy as np
-        
         # Convert PIL image to RGB array for analysis
         img_array = np.array(image.convert('RGB'))
         height, width, channels = img_array.shape
@@ -661,9 +1008,9 @@ class CropDiseaseDetector:
         reduced = img_array // 8  # Reduce to 32 levels per channel
         reshaped = reduced.reshape(-1, 3)
         
-        # Count unique colors
-        unique_colors = np.unique(reshaped, axis=0)
-        return len(unique_colors)
+        # Count unique colors by packing each reduced pixel into one 15-bit code
+        codes = (reshaped[:, 0].astype(np.int32) << 10) | (reshaped[:, 1].astype(np.int32) << 5) | reshaped[:, 2]
+        return int(np.count_nonzero(np.bincount(codes, minlength=1 << 15)))
     
     def _detect_artificial_edges(self, img_array):
         """Detect perfectly straight edges typical of graphics."""
@@ -866,15 +1213,28 @@ class CropDiseaseDetector:
         if kernel_size < 3:
             return 0
         
-        variances = []
         step = max(1, kernel_size//2)
+        rows = np.arange(0, gray.shape[0] - kernel_size, step)
+        cols = np.arange(0, gray.shape[1] - kernel_size, step)
+        if not len(rows) or not len(cols):
+            return 0
         
-        for i in range(0, gray.shape[0] - kernel_size, step):
-            for j in range(0, gray.shape[1] - kernel_size, step):
-                patch = gray[i:i+kernel_size, j:j+kernel_size]
-                variances.append(np.var(patch))
+        # Patch sums from integral images instead of one np.var call per patch
+        pixels = gray.astype(np.int64)
+        n = kernel_size * kernel_size
+        sums = self._window_sums(pixels, rows, cols, kernel_size)
+        sq_sums = self._window_sums(pixels * pixels, rows, cols, kernel_size)
+        variances = (n * sq_sums - sums * sums) / (n * n)
         
-        return np.mean(variances) / 255.0 if variances else 0
+        return np.mean(variances) / 255.0
+    
+    @staticmethod
+    def _window_sums(values, rows, cols, size):
+        """Sum each size x size window whose top-left corner is at (rows, cols)."""
+        integral = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=np.int64)
+        integral[1:, 1:] = values.cumsum(axis=0).cumsum(axis=1)
+        r, c = rows[:, None], cols[None, :]
+        return integral[r + size, c + size] - integral[r, c + size] - integral[r + size, c] + integral[r, c]
     
     def _calculate_texture_uniformity(self, gray):
         """Calculate texture uniformity."""
@@ -965,16 +1325,16 @@ class CropDiseaseDetector:
         # Quality assessment based on resolution
         if total_pixels > 2000000:  # 2MP+
             quality_score = "Excellent"
-            rating = random.uniform(8.5, 10.0)
+            rating = self._rng.uniform(8.5, 10.0)
         elif total_pixels > 1000000:  # 1MP+
             quality_score = "Good"
-            rating = random.uniform(7.0, 8.5)
+            rating = self._rng.uniform(7.0, 8.5)
         elif total_pixels > 500000:  # 0.5MP+
             quality_score = "Fair"
-            rating = random.uniform(5.5, 7.0)
+            rating = self._rng.uniform(5.5, 7.0)
         else:
             quality_score = "Poor"
-            rating = random.uniform(3.0, 5.5)
+            rating = self._rng.uniform(3.0, 5.5)
         
         # Check if image is too small or too large
         quality_notes = []
@@ -996,52 +1356,9 @@ class CropDiseaseDetector:
     def _advanced_disease_simulation(self, crop_type, image_quality, location):
         """Advanced disease simulation based on multiple factors."""
         
-        # Base disease mapping
-        crop_disease_mapping = {
-            'Rice': [
-                ('leaf_spot', 'Brown Leaf Spot', 0.25),
-                ('bacterial_blight', 'Bacterial Leaf Blight', 0.20),
-                ('blast_disease', 'Rice Blast', 0.15),
-                ('sheath_rot', 'Sheath Rot', 0.10)
-            ],
-            'Wheat': [
-                ('rust_disease', 'Yellow Rust', 0.30),
-                ('powdery_mildew', 'Powdery Mildew', 0.25),
-                ('leaf_spot', 'Leaf Spot', 0.20),
-                ('fusarium_head', 'Fusarium Head Blight', 0.15)
-            ],
-            'Cotton': [
-                ('bacterial_blight', 'Bacterial Blight', 0.25),
-                ('leaf_spot', 'Leaf Spot', 0.20),
-                ('verticillium_wilt', 'Verticillium Wilt', 0.18),
-                ('bollworm', 'Bollworm Damage', 0.15)
-            ],
-            'Tomato': [
-                ('late_blight', 'Late Blight', 0.30),
-                ('early_blight', 'Early Blight', 0.25),
-                ('leaf_spot', 'Septoria Leaf Spot', 0.20),
-                ('viral_mosaic', 'Mosaic Virus', 0.15)
-            ],
-            'Potato': [
-                ('late_blight', 'Late Blight', 0.35),
-                ('early_blight', 'Early Blight', 0.25),
-                ('scab', 'Common Scab', 0.15),
-                ('black_scurf', 'Black Scurf', 0.10)
-            ],
-            'Corn': [
-                ('corn_rust', 'Common Rust', 0.30),
-                ('leaf_blight', 'Northern Corn Leaf Blight', 0.25),
-                ('gray_leaf_spot', 'Gray Leaf Spot', 0.20),
-                ('smut', 'Common Smut', 0.10)
-            ]
-        }
         
         # Get diseases for crop type
-        possible_diseases = crop_disease_mapping.get(crop_type, [
-            ('leaf_spot', 'General Leaf Spot', 0.30),
-            ('fungal_infection', 'Fungal Infection', 0.25),
-            ('bacterial_disease', 'Bacterial Disease', 0.20)
-        ])
+        possible_diseases = SIMULATED_CROP_DISEASES.get(_canonical_crop(crop_type), DEFAULT_SIMULATED_DISEASES)
         
         # Adjust probabilities based on image quality
         quality_multiplier = 1.0
@@ -1060,14 +1377,14 @@ class CropDiseaseDetector:
                 location_risk = 0.8  # Arid regions
         
         # Simulate detection
-        healthy_chance = random.uniform(0.15, 0.35)  # 15-35% chance of healthy plant
+        healthy_chance = self._rng.uniform(0.15, 0.35)  # 15-35% chance of healthy plant
         
-        if random.random() < healthy_chance:
+        if self._rng.random() < healthy_chance:
             return [{
                 'disease_id': 'healthy',
                 'name': 'Healthy Plant',
                 'severity': 'none',
-                'confidence': round(random.uniform(0.85, 0.95), 2),
+                'confidence': round(self._rng.uniform(0.85, 0.95), 2),
                 'description': 'No disease symptoms detected. Plant appears healthy.',
                 'risk_level': 'None',
                 'treatment_cost': 0
@@ -1075,23 +1392,18 @@ class CropDiseaseDetector:
         
         # Select diseases based on weighted probabilities
         detected = []
-        num_diseases = random.choices([1, 2], weights=[75, 25])[0]  # Mostly 1 disease
-        
-        # Sort by probability and select top diseases
-        sorted_diseases = sorted(possible_diseases, key=lambda x: x[2], reverse=True)
+        num_diseases = self._weighted_choice(SIMULATED_DISEASE_COUNTS, SIMULATED_DISEASE_COUNT_CDF)
         
-        for i in range(min(num_diseases, len(sorted_diseases))):
-            disease_id, disease_name, base_prob = sorted_diseases[i]
+        # Diseases are listed by probability, so the top ones come first
+        for disease_id, disease_name, base_prob in possible_diseases[:num_diseases]:
             
             # Adjust probability
             final_prob = base_prob * quality_multiplier * location_risk
             
-            if random.random() < final_prob:
-                severity_options = ['mild', 'moderate', 'severe']
-                severity_weights = [50, 35, 15]  # Most diseases are mild to moderate
-                severity = random.choices(severity_options, weights=severity_weights)[0]
+            if self._rng.random() < final_prob:
+                severity = self._weighted_choice(SEVERITY_LEVELS, SEVERITY_CDF)
                 
-                confidence = round(random.uniform(0.75, 0.92) * quality_multiplier, 2)
+                confidence = round(self._rng.uniform(0.75, 0.92) * quality_multiplier, 2)
                 confidence = min(confidence, 0.95)  # Cap at 95%
                 
                 detected.append({
@@ -1102,7 +1414,7 @@ class CropDiseaseDetector:
                     'description': self._get_disease_description(disease_id, severity),
                     'risk_level': self._calculate_risk_level(severity, crop_type),
                     'treatment_cost': self._estimate_treatment_cost(disease_id, severity),
-                    'affected_area': f"{random.randint(5, 40)}% of visible area"
+                    'affected_area': f"{self._rng.randint(5, 40)}% of visible area"
                 })
         
         return detected if detected else [{
@@ -1117,25 +1429,7 @@ class CropDiseaseDetector:
     
     def _get_disease_description(self, disease_id, severity):
         """Get detailed description of the disease."""
-        descriptions = {
-            'leaf_spot': {
-                'mild': 'Small brown spots visible on few leaves',
-                'moderate': 'Multiple brown spots with yellow halos on several leaves',
-                'severe': 'Extensive spotting with leaf yellowing and drop'
-            },
-            'bacterial_blight': {
-                'mild': 'Water-soaked lesions on leaf edges',
-                'moderate': 'Expanding lesions with bacterial ooze',
-                'severe': 'Widespread leaf necrosis and plant wilting'
-            },
-            'rust_disease': {
-                'mild': 'Small orange pustules on leaf surface',
-                'moderate': 'Numerous rust pustules covering leaves',
-                'severe': 'Severe rust infection causing leaf death'
-            }
-        }
-        
-        return descriptions.get(disease_id, {}).get(severity, 'Disease symptoms detected on plant')
+        return DISEASE_DESCRIPTIONS.get(disease_id, {}).get(severity, 'Disease symptoms detected on plant')
     
     def _calculate_risk_level(self, severity, crop_type):
         """Calculate risk level based on severity and crop type."""
@@ -1148,24 +1442,8 @@ class CropDiseaseDetector:
     
     def _estimate_treatment_cost(self, disease_id, severity):
         """Estimate treatment cost based on disease and severity."""
-        base_costs = {
-            'leaf_spot': 800,
-            'bacterial_blight': 1200,
-            'rust_disease': 1000,
-            'powdery_mildew': 600,
-            'late_blight': 1500,
-            'early_blight': 900
-        }
-        
-        base_cost = base_costs.get(disease_id, 800)
-        
-        severity_multipliers = {
-            'mild': 0.8,
-            'moderate': 1.0,
-            'severe': 1.5
-        }
-        
-        return int(base_cost * severity_multipliers.get(severity, 1.0))
+        base_cost = TREATMENT_BASE_COSTS.get(disease_id, 800)
+        return int(base_cost * SEVERITY_COST_MULTIPLIERS.get(severity, 1.0))
     
     def _calculate_overall_confidence(self, diseases, image_quality):
         """Calculate overall analysis confidence."""
@@ -1183,99 +1461,52 @@ class CropDiseaseDetector:
     
     def _generate_general_recommendations(self, crop_type, diseases):
         """Generate general recommendations based on analysis."""
-        recommendations = []
-        
         if diseases[0]['disease_id'] == 'healthy':
-            recommendations = [
-                'Continue regular monitoring',
-                'Maintain proper irrigation schedule',
-                'Ensure adequate nutrition',
-                'Practice good field hygiene'
-            ]
-        else:
-            severe_count = sum(1 for d in diseases if d['severity'] == 'severe')
-            if severe_count > 0:
-                recommendations.append('Immediate action required - treat within 24 hours')
-            
-            recommendations.extend([
-                'Monitor weather conditions closely',
-                'Consider preventive treatments for healthy plants',
-                'Document disease progression with photos',
-                'Consult local agricultural extension officer'
-            ])
+            return HEALTHY_RECOMMENDATIONS
         
-        return recommendations
+        if any(d['severity'] == 'severe' for d in diseases):
+            return SEVERE_DISEASE_RECOMMENDATIONS
+        return DISEASE_RECOMMENDATIONS
 
     def _simulate_disease_detection(self, crop_type):
         """Simulate realistic disease detection based on crop type and season."""
         
-        # Common diseases by crop type
-        crop_disease_mapping = {
-            'Rice': ['leaf_spot', 'bacterial_blight'],
-            'Wheat': ['rust_disease', 'powdery_mildew', 'leaf_spot'],
-            'Cotton': ['bacterial_blight', 'leaf_spot'],
-            'Tomato': ['leaf_spot', 'bacterial_blight', 'viral_mosaic'],
-            'Potato': ['leaf_spot'],
-            'Corn': ['rust_disease'],
-            'Unknown': ['leaf_spot', 'powdery_mildew']
-        }
-        
-        possible_diseases = crop_disease_mapping.get(crop_type, crop_disease_mapping['Unknown'])
+        possible_diseases = CROP_DISEASE_MAP.get(_canonical_crop(crop_type), CROP_DISEASE_MAP['Unknown'])
         
         # Randomly select 1-2 diseases (simulate real detection)
-        num_diseases = random.choices([0, 1, 2], weights=[10, 70, 20])[0]
+        num_diseases = self._weighted_choice(BASIC_DISEASE_COUNTS, BASIC_DISEASE_COUNT_CDF)
         
         if num_diseases == 0:
             return [{'disease_id': 'healthy', 'name': 'No Disease Detected', 'severity': 'none', 'confidence': 0.9}]
         
         detected = []
-        selected_diseases = random.sample(possible_diseases, min(num_diseases, len(possible_diseases)))
+        selected_diseases = self._rng.sample(possible_diseases, min(num_diseases, len(possible_diseases)))
         
         for disease_id in selected_diseases:
             if disease_id in self.disease_database:
-                severity = random.choices(['mild', 'moderate', 'severe'], weights=[50, 35, 15])[0]
+                severity = self._weighted_choice(SEVERITY_LEVELS, SEVERITY_CDF)
                 detected.append({
                     'disease_id': disease_id,
                     'name': self.disease_database[disease_id]['name'],
                     'severity': severity,
-                    'confidence': round(random.uniform(0.7, 0.95), 2)
+                    'confidence': round(self._rng.uniform(0.7, 0.95), 2)
                 })
         
         return detected
     
     def _assess_image_quality(self):
         """Assess the quality of the uploaded image."""
-        quality_scores = ['Excellent', 'Good', 'Fair', 'Poor']
-        quality = random.choices(quality_scores, weights=[20, 50, 25, 5])[0]
-        
-        quality_feedback = {
-            'Excellent': 'Perfect lighting and focus for accurate analysis',
-            'Good': 'Good image quality, analysis highly reliable', 
-            'Fair': 'Acceptable quality, consider retaking in better light',
-            'Poor': 'Poor image quality may affect accuracy - please retake'
-        }
-        
+        quality, feedback = self._weighted_choice(QUALITY_TABLE, QUALITY_CDF)
         return {
             'score': quality,
-            'feedback': quality_feedback[quality]
+            'feedback': feedback
         }
     
     def _assess_environmental_risk(self, crop_type, location="Unknown"):
         """Assess environmental factors affecting disease risk based on crop type and location."""
-        current_month = datetime.now().month
-        
         # Base seasonal risk factors
-        risk_factors = []
-        
-        if current_month in [6, 7, 8, 9]:  # Monsoon season
-            base_season = 'Monsoon'
-            risk_factors.extend(['High humidity', 'Excessive moisture', 'Poor drainage'])
-        elif current_month in [10, 11, 12, 1]:  # Post-monsoon/winter
-            base_season = 'Winter'
-            risk_factors.extend(['Temperature fluctuation', 'Dew formation'])
-        else:  # Summer
-            base_season = 'Summer'
-            risk_factors.extend(['Heat stress', 'Drought conditions'])
+        base_season = MONTH_TO_SEASON[datetime.now().month - 1]
+        risk_factors = list(SEASON_RISK_FACTORS[base_season])
         
         # Add location-specific risk factors
         if location and location.lower() != 'unknown':
@@ -1305,19 +1536,15 @@ class CropDiseaseDetector:
         else:
             risk_level_weight = 1.0
         
-        # Calculate weighted risk level
-        base_risk_levels = ['Low', 'Medium', 'High']
-        base_weights = [30, 50, 20]  # Default distribution
-        
-        # Adjust weights based on location
+        # Calculate weighted risk level, adjusted for location
         if risk_level_weight > 1.1:
-            adjusted_weights = [15, 35, 50]  # Higher risk
+            risk_cdf = HIGH_RISK_LEVEL_CDF
         elif risk_level_weight < 0.9:
-            adjusted_weights = [50, 35, 15]  # Lower risk
+            risk_cdf = LOW_RISK_LEVEL_CDF
         else:
-            adjusted_weights = base_weights
+            risk_cdf = RISK_LEVEL_CDF
         
-        risk_level = random.choices(base_risk_levels, weights=adjusted_weights)[0]
+        risk_level = self._weighted_choice(RISK_LEVELS, risk_cdf)
         
         return {
             'season': base_season,
@@ -1329,40 +1556,18 @@ class CropDiseaseDetector:
     
     def _get_environmental_summary(self, season, risk_level, location):
         """Generate environmental risk summary."""
-        summaries = {
-            'Monsoon': {
-                'High': f"High disease risk due to monsoon conditions in {location}. Monitor closely for fungal diseases.",
-                'Medium': f"Moderate risk during monsoon season in {location}. Maintain preventive measures.", 
-                'Low': f"Lower risk despite monsoon - good drainage in {location} helps."
-            },
-            'Winter': {
-                'High': f"Winter conditions in {location} favor certain diseases. Watch for frost damage.",
-                'Medium': f"Moderate winter risk in {location}. Temperature variations may stress plants.",
-                'Low': f"Low disease risk during winter in {location}. Good season for crop health."
-            },
-            'Summer': {
-                'High': f"High heat stress risk in {location}. Ensure adequate irrigation.",
-                'Medium': f"Moderate summer stress in {location}. Monitor water requirements.",
-                'Low': f"Manageable summer conditions in {location}. Maintain regular care."
-            }
-        }
-        
-        return summaries.get(season, {}).get(risk_level, "Environmental assessment completed.")
+        template = ENVIRONMENTAL_SUMMARIES.get(season, {}).get(risk_level)
+        if template is None:
+            return "Environmental assessment completed."
+        return template.format(location=location)
 
     def _calculate_urgency(self, diseases):
         """Calculate urgency level based on detected diseases."""
         if not diseases or diseases[0]['disease_id'] == 'healthy':
             return 'None'
         
-        max_severity = max([d.get('severity', 'mild') for d in diseases])
-        
-        urgency_map = {
-            'mild': 'Low',
-            'moderate': 'Medium', 
-            'severe': 'High'
-        }
-        
-        return urgency_map.get(max_severity, 'Low')
+        rank = max(_severity_rank(d.get('severity', 'mild')) for d in diseases)
+        return URGENCY_LEVELS[rank - 1]
     
     def get_treatment_plan(self, disease_id, severity, crop_type):
         """Get detailed treatment plan for detected disease."""
@@ -1376,130 +1581,45 @@ class CropDiseaseDetector:
                 'success_rate': 100
             }
         
-        disease = self.disease_database[disease_id]
-        treatments = disease['treatments'].get(severity, disease['treatments']['mild'])
-        cost = disease['cost_estimate'].get(severity, 500)
-        
-        # Generate timeline based on severity
-        timeline_map = {
-            'mild': '1-2 weeks',
-            'moderate': '2-4 weeks', 
-            'severe': '4-6 weeks'
-        }
-        
-        success_rates = {
-            'mild': random.randint(85, 95),
-            'moderate': random.randint(70, 85),
-            'severe': random.randint(50, 70)
-        }
+        # Fresh lists per call, so callers can edit their plan without touching the cache
+        static_plan = _static_treatment_plan(disease_id, severity)
+        plan = dict(static_plan)
+        plan['immediate_actions'] = list(static_plan['immediate_actions'])
+        plan['treatments'] = list(static_plan['treatments'])
         
-        return {
-            'immediate_actions': treatments[:2],
-            'treatments': treatments,
-            'timeline': timeline_map.get(severity, '2-3 weeks'),
-            'cost_estimate': cost,
-            'success_rate': success_rates.get(severity, 75),
-            'follow_up': 'Monitor weekly and document progress'
-        }
+        success_range = SUCCESS_RATE_RANGES.get(severity)
+        plan['success_rate'] = self._rng.randint(*success_range) if success_range else 75
+        plan['follow_up'] = 'Monitor weekly and document progress'
+        return plan
     
     def get_prevention_strategies(self, crop_type, location="Unknown"):
         """Get comprehensive prevention strategies for crop health."""
-        
-        # Generic prevention strategies
-        general_strategies = [
-            '🌱 **Seed Selection**: Use certified, disease-resistant varieties',
-            '🚰 **Water Management**: Implement proper irrigation scheduling', 
-            '🧹 **Field Sanitation**: Remove crop debris and weeds regularly',
-            '🔄 **Crop Rotation**: Follow 2-3 year rotation with non-host crops',
-            '⚖️ **Balanced Nutrition**: Maintain optimal NPK levels',
-            '🔍 **Regular Monitoring**: Weekly field inspections for early detection',
-            '🛡️ **Integrated Pest Management**: Use biological and chemical controls wisely',
-            '📅 **Timely Operations**: Follow recommended planting and harvesting schedules'
-        ]
-        
-        # Crop-specific strategies
-        crop_specific = {
-            'Rice': [
-                '💧 Maintain proper water levels in fields',
-                '🌾 Use short-duration varieties in disease-prone areas',
-                '🦆 Consider duck farming for integrated pest control'
-            ],
-            'Wheat': [
-                '❄️ Follow recommended sowing dates to avoid rust',
-                '💨 Ensure proper air circulation between plants',
-                '🌡️ Monitor weather for rust-favorable conditions'
-            ],
-            'Cotton': [
-                '🐛 Implement bollworm management strategies',
-                '🌿 Use trap crops around main cotton fields',
-                '💧 Avoid water stress during flowering'
-            ]
-        }
-        
-        strategies = general_strategies.copy()
-        if crop_type in crop_specific:
-            strategies.extend(crop_specific[crop_type])
-        
         return {
-            'general_strategies': general_strategies,
-            'crop_specific': crop_specific.get(crop_type, []),
+            'general_strategies': GENERAL_PREVENTION_STRATEGIES,
+            'crop_specific': CROP_PREVENTION_STRATEGIES.get(_canonical_crop(crop_type), ()),
             'seasonal_calendar': self._generate_seasonal_calendar(crop_type),
             'monitoring_checklist': self._generate_monitoring_checklist()
         }
     
     def _generate_seasonal_calendar(self, crop_type):
         """Generate seasonal disease management calendar."""
-        calendar = {
-            'Pre-Planting (15-30 days before)': [
-                'Soil treatment with beneficial microbes',
-                'Field preparation and debris removal',
-                'Seed treatment with fungicides'
-            ],
-            'Planting Stage (0-15 days)': [
-                'Use certified disease-free seeds',
-                'Optimal spacing for air circulation',
-                'Soil moisture management'
-            ],
-            'Vegetative Stage (15-45 days)': [
-                'Weekly disease monitoring',
-                'Balanced fertilizer application',
-                'Preventive fungicide sprays if needed'
-            ],
-            'Reproductive Stage (45-75 days)': [
-                'Intensive monitoring for diseases',
-                'Water stress management',
-                'Targeted disease control measures'
-            ],
-            'Maturity & Harvest (75+ days)': [
-                'Pre-harvest disease assessment',
-                'Proper harvesting techniques',
-                'Post-harvest field sanitation'
-            ]
-        }
-        
-        return calendar
+        return dict(SEASONAL_CALENDAR)  # Stages map to tuples, so a shallow copy is enough
     
     def _generate_monitoring_checklist(self):
         """Generate weekly monitoring checklist."""
-        return [
-            '👀 **Visual Inspection**: Check for spots, lesions, or unusual coloration',
-            '🍃 **Leaf Health**: Examine both upper and lower leaf surfaces',
-            '🌿 **Plant Vigor**: Assess overall plant health and growth',
-            '💧 **Moisture Conditions**: Check soil moisture and drainage',
-            '🌡️ **Weather Monitoring**: Track temperature and humidity',
-            '📸 **Photo Documentation**: Record suspicious symptoms',
-            '📝 **Record Keeping**: Document findings and actions taken',
-            '🔄 **Treatment Follow-up**: Monitor effectiveness of treatments'
-        ]
+        return MONITORING_CHECKLIST
     
     def generate_expert_consultation_request(self, analysis_report):
         """Generate a structured request for expert consultation."""
-        
         diseases = analysis_report['diseases_detected']
-        severe_diseases = [d for d in diseases if d.get('severity') == 'severe']
-        
+        has_severe = any(d.get('severity') == 'severe' for d in diseases)
+        return self._build_consultation_request(analysis_report, has_severe)
+    
+    def _build_consultation_request(self, analysis_report, has_severe):
+        """Build the consultation request once the severity check is known."""
+        diseases = analysis_report['diseases_detected']
         consultation_needed = (
-            len(severe_diseases) > 0 or
+            has_severe or
             analysis_report['urgency_level'] == 'High' or
             analysis_report['confidence_score'] < 0.8
         )
@@ -1507,23 +1627,48 @@ class CropDiseaseDetector:
         if not consultation_needed:
             return {'needed': False, 'message': 'Current analysis sufficient for management'}
         
+        # Collect names and severities in a single pass over the diseases
+        names, severities = [], []
+        for d in diseases:
+            names.append(d['name'])
+            severities.append(d['severity'])
+        
         expert_request = {
             'needed': True,
-            'priority': 'High' if severe_diseases else 'Medium',
+            'priority': 'High' if has_severe else 'Medium',
             'summary': f"Disease detected in {analysis_report['crop_type']} crop",
-            'key_concerns': [
-                f"Detected: {', '.join([d['name'] for d in diseases])}",
-                f"Severity: {', '.join([d['severity'] for d in diseases])}",
+            'key_concerns': (
+                f"Detected: {', '.join(names)}",
+                f"Severity: {', '.join(severities)}",
                 f"Confidence: {analysis_report['confidence_score']}"
-            ],
-            'questions_for_expert': [
-                'Please confirm the disease identification',
-                'Are the recommended treatments appropriate?',
-                'Any additional management strategies needed?',
-                'Prevention measures for future crops?'
-            ],
-            'estimated_consultation_fee': random.randint(500, 1500),
-            'recommended_expert_types': ['Plant Pathologist', 'Agricultural Extension Officer']
+            ),
+            'questions_for_expert': EXPERT_QUESTIONS,
+            'estimated_consultation_fee': self._rng.randint(500, 1500),
+            'recommended_expert_types': EXPERT_TYPES
         }
         
-        return expert_request
\ No newline at end of file
+        return expert_request
+    
+    def full_report(self, image_data, crop_type="Unknown", location="Unknown"):
+        """
+        Analyze an image and attach treatment plans, prevention strategies and the
+        expert consultation request, walking the detected diseases only once.
+        """
+        report = self.analyze_image(image_data, crop_type, location)
+        if not report['is_valid_crop_image']:
+            return report
+        
+        treatment_plans = {}
+        has_severe = False
+        for disease in report['diseases_detected']:
+            severity = disease.get('severity')
+            has_severe = has_severe or severity == 'severe'
+            if disease['disease_id'] != 'healthy':
+                treatment_plans[disease['disease_id']] = self.get_treatment_plan(
+                    disease['disease_id'], severity, crop_type
+                )
+        
+        report['treatment_plans'] = treatment_plans
+        report['prevention'] = self.get_prevention_strategies(crop_type, location)
+        report['expert_consultation'] = self._build_consultation_request(report, has_severe)
+        return report
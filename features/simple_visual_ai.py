@@ -12,6 +12,15 @@ import json
 class VisualExplainableAI:
     """Creates simple visual explanations for agricultural recommendations."""
     
+    # Bar colours for the benchmarking chart
+    BENCHMARK_COLORS = {
+        'Your Yield': '#dc3545',
+        'Average': '#ffc107',
+        'Top 25%': '#28a745',
+        'Top 10%': '#28a745',
+        'Maximum': '#ffc107'
+    }
+    
     def __init__(self, data_loader):
         self.data_loader = data_loader
         
@@ -299,14 +308,19 @@ class VisualExplainableAI:
             'Maximum': benchmarks.get('max_yield_achieved', 0)
         }
         
+        labels = list(comparison_data)
+        values = np.fromiter(comparison_data.values(), dtype=np.float32, count=len(labels))
+        # Scale all bars at once; clamp so negative benchmarks never yield negative widths
+        widths = np.clip((values * 3).astype(int), 0, 600)
+        
         bars = ""
-        for label, value in comparison_data.items():
-            color = '#dc3545' if label == 'Your Yield' else '#28a745' if 'Top' in label else '#ffc107'
+        for label, value, width in zip(labels, values, widths):
+            color = self.BENCHMARK_COLORS[label]
             bars += f'''
             <div class="benchmark-bar">
                 <div class="benchmark-label">{label}</div>
                 <div class="benchmark-bar-bg">
-                    <div class="benchmark-bar-fill" style="width: {int(value*3)}px; background: {color};"></div>
+                    <div class="benchmark-bar-fill" style="width: {width}px; background: {color};"></div>
                 </div>
                 <div class="benchmark-value">{value:.1f}</div>
             </div>
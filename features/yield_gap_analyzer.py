@@ -11,39 +11,75 @@ from typing import Dict, List, Tuple
 # import seaborn as sns
 from pathlib import Path
 
+from src.core.data_loader import quantile_by_selection
+
+# Performance assessment messages, best first; a message's index is its
+# recommendation severity
+PERFORMANCE_ASSESSMENTS = (
+    "🏆 Excellent! You're already in the top 10% of performers.",
+    "👍 Good performance! You're in the top 25% range.",
+    "📈 Above average, but room for improvement.",
+    "🎯 Significant improvement potential identified."
+)
+
+# Severity of the improvement advice that follows the assessment
+ADVICE_SEVERITY = len(PERFORMANCE_ASSESSMENTS)
+
 class YieldGapAnalyzer:
     """Analyzes yield gaps and benchmarks against top performers."""
     
     def __init__(self, data_loader):
         self.data_loader = data_loader
+        self._bench_cache = {}
         
     def calculate_yield_benchmarks(self, crop: str, state: str, season: str = None) -> Dict:
-        """Calculate yield benchmarks for a specific crop-state combination."""
+        """Calculate yield benchmarks for a specific crop-state combination.
         
-        # Filter data
-        data = self.data_loader.filter_data(crop=crop, state=state, season=season)
+        Results are memoized per (crop, state, season) and dropped whenever the
+        data loader re-merges its datasets.
+        """
         
-        if data.empty:
+        key = (crop, state, season)
+        cached = self._bench_cache.get(key)
+        if cached is not None and cached[0] == self.data_loader.data_version:
+            return cached[1]
+        
+        benchmarks = self._compute_yield_benchmarks(crop, state, season)
+        self._bench_cache[key] = (self.data_loader.data_version, benchmarks)
+        
+        return benchmarks
+    
+    def _compute_yield_benchmarks(self, crop: str, state: str, season: str = None) -> Dict:
+        """Build yield benchmarks from the data loader's precomputed group statistics."""
+        
+        stats = self.data_loader.get_benchmark_stats(crop, state, season)
+        
+        if stats is None:
             return {
                 'error': f'No data available for {crop} in {state}' + (f' during {season}' if season else ''),
-                'available_seasons': self.data_loader.filter_data(crop=crop, state=state)['season'].str.strip().unique().tolist()
+                'available_seasons': self.data_loader.seasons_for(crop, state)
             }
         
-        yields = data['yield'].values
+        # Records are still needed for the high-performer and correlation analysis
+        data = self.data_loader.filter_data(crop=crop, state=state, season=season)
         
         # Calculate benchmarks
         benchmarks = {
-            'total_records': len(data),
-            'years_covered': f"{data['year'].min()}-{data['year'].max()}",
-            'average_yield': round(np.mean(yields), 2),
-            'median_yield': round(np.median(yields), 2),
-            'top_10_percent': round(np.percentile(yields, 90), 2),
-            'top_25_percent': round(np.percentile(yields, 75), 2),
-            'bottom_25_percent': round(np.percentile(yields, 25), 2),
-            'max_yield_achieved': round(np.max(yields), 2),
-            'min_yield_recorded': round(np.min(yields), 2),
-            'yield_std': round(np.std(yields), 2),
-            'consistent_high_performers': self._find_consistent_performers(data, percentile=80),
+            'total_records': int(stats['n']),
+            'years_covered': f"{int(stats['year_min'])}-{int(stats['year_max'])}",
+            'average_yield': round(stats['avg'], 2),
+            'median_yield': round(stats['med'], 2),
+            'top_10_percent': round(stats['p90'], 2),
+            'top_25_percent': round(stats['p75'], 2),
+            'bottom_25_percent': round(stats['p25'], 2),
+            'max_yield_achieved': round(stats['mx'], 2),
+            'min_yield_recorded': round(stats['mn'], 2),
+            'yield_std': round(stats['std'], 2),
+            'consistent_high_performers': self._find_consistent_performers(
+                data,
+                percentile=self.data_loader.HIGH_PERFORMER_PERCENTILE,
+                high_performers=self.data_loader.get_high_performers(crop, state, season)
+            ),
             'improvement_factors': self._analyze_improvement_factors(data)
         }
         
@@ -74,11 +110,69 @@ class YieldGapAnalyzer:
         
         return gap_analysis
     
-    def _find_consistent_performers(self, data: pd.DataFrame, percentile: float = 80) -> Dict:
+    def analyze_user_gap_batch(self, requests: pd.DataFrame) -> pd.DataFrame:
+        """Analyze yield gaps for many users/regions at once.
+        
+        Expects columns user_yield, crop, state and optionally season. Returns one
+        row per request with the benchmark yields, gaps and percentile rank;
+        requests without matching records get NaN.
+        """
+        
+        result = requests.reset_index(drop=True)
+        if 'season' in result.columns:
+            seasons = result['season'].astype(object).str.strip()
+            seasons = seasons.where(seasons != '')
+        else:
+            seasons = pd.Series(np.nan, index=result.index, dtype=object)
+        keys = pd.DataFrame({'crop': result['crop'], 'state': result['state'], 'season': seasons})
+        has_season = seasons.notna().to_numpy()
+        
+        # Attach benchmark statistics with one reindex per lookup table
+        stat_columns = ['avg', 'p75', 'p90', 'mx']
+        stats = np.full((len(result), len(stat_columns)), np.nan)
+        for mask, table, key_columns in (
+            (has_season, self.data_loader.benchmarks_table, ['crop', 'state', 'season']),
+            (~has_season, self.data_loader.crop_state_benchmarks, ['crop', 'state'])
+        ):
+            if mask.any():
+                lookup = pd.MultiIndex.from_frame(keys.loc[mask, key_columns])
+                stats[mask] = table[stat_columns].reindex(lookup).to_numpy()
+        stats = np.round(stats, 2)
+        
+        # Rank every request in a group with a single searchsorted
+        user_yields = result['user_yield'].to_numpy(dtype=np.float64)
+        ranks = np.full(len(result), np.nan)
+        groups = keys.groupby(['crop', 'state', 'season'], dropna=False, sort=False).indices
+        for (crop, state, season), positions in groups.items():
+            sorted_yields = self.data_loader.get_sorted_yields(crop, state, season if isinstance(season, str) else None)
+            if sorted_yields is not None and len(sorted_yields) > 0:
+                ranks[positions] = np.searchsorted(sorted_yields, user_yields[positions], side='left') / len(sorted_yields) * 100
+        
+        gaps = np.round(stats - user_yields[:, None], 2)
+        
+        return pd.DataFrame({
+            'user_yield': user_yields,
+            'crop': result['crop'],
+            'state': result['state'],
+            'season': seasons,
+            'average_yield': stats[:, 0],
+            'top_25_percent': stats[:, 1],
+            'top_10_percent': stats[:, 2],
+            'max_yield_achieved': stats[:, 3],
+            'gap_vs_average': gaps[:, 0],
+            'gap_vs_top_25': gaps[:, 1],
+            'gap_vs_top_10': gaps[:, 2],
+            'gap_vs_maximum': gaps[:, 3],
+            'percentile_rank': np.round(ranks, 1)
+        })
+    
+    def _find_consistent_performers(self, data: pd.DataFrame, percentile: float = 80,
+                                    high_performers: pd.DataFrame = None) -> Dict:
         """Find fields/years that consistently perform in top percentile."""
         
-        threshold = np.percentile(data['yield'], percentile)
-        high_performers = data[data['yield'] >= threshold]
+        if high_performers is None:
+            threshold = quantile_by_selection(data['yield'].to_numpy(), percentile / 100)
+            high_performers = data[data['yield'] >= threshold]
         
         return {
             'count': len(high_performers),
@@ -92,22 +186,34 @@ class YieldGapAnalyzer:
         
         characteristics = {}
         
+        has_weather = 'avg_temp_c' in high_performers.columns
+        has_soil = 'pH' in high_performers.columns
+        
+        # Average every characteristic column in one pass
+        columns = ['fertilizer']
+        if has_weather:
+            columns.extend(['avg_temp_c', 'total_rainfall_mm', 'avg_humidity_percent'])
+        if has_soil:
+            columns.extend(['pH', 'N', 'P', 'K'])
+        means = high_performers[columns].mean()
+        
         # Fertilizer usage
-        characteristics['avg_fertilizer'] = round(high_performers['fertilizer'].mean(), 0)
-        characteristics['fertilizer_range'] = f"{high_performers['fertilizer'].quantile(0.25):.0f}-{high_performers['fertilizer'].quantile(0.75):.0f}"
+        fertilizer_q25, fertilizer_q75 = high_performers['fertilizer'].quantile([0.25, 0.75]).to_numpy()
+        characteristics['avg_fertilizer'] = round(float(means['fertilizer']), 0)
+        characteristics['fertilizer_range'] = f"{fertilizer_q25:.0f}-{fertilizer_q75:.0f}"
         
         # Weather conditions
-        if 'avg_temp_c' in high_performers.columns:
-            characteristics['optimal_temp'] = round(high_performers['avg_temp_c'].mean(), 1)
-            characteristics['optimal_rainfall'] = round(high_performers['total_rainfall_mm'].mean(), 0)
-            characteristics['optimal_humidity'] = round(high_performers['avg_humidity_percent'].mean(), 1)
+        if has_weather:
+            characteristics['optimal_temp'] = round(float(means['avg_temp_c']), 1)
+            characteristics['optimal_rainfall'] = round(float(means['total_rainfall_mm']), 0)
+            characteristics['optimal_humidity'] = round(float(means['avg_humidity_percent']), 1)
         
         # Soil conditions
-        if 'pH' in high_performers.columns:
-            characteristics['optimal_pH'] = round(high_performers['pH'].mean(), 1)
-            characteristics['optimal_N'] = round(high_performers['N'].mean(), 0)
-            characteristics['optimal_P'] = round(high_performers['P'].mean(), 0)
-            characteristics['optimal_K'] = round(high_performers['K'].mean(), 0)
+        if has_soil:
+            characteristics['optimal_pH'] = round(float(means['pH']), 1)
+            characteristics['optimal_N'] = round(float(means['N']), 0)
+            characteristics['optimal_P'] = round(float(means['P']), 0)
+            characteristics['optimal_K'] = round(float(means['K']), 0)
         
         return characteristics
     
@@ -121,7 +227,14 @@ class YieldGapAnalyzer:
         if 'pH' in data.columns:
             numeric_columns.extend(['N', 'P', 'K', 'pH'])
             
-        correlations = data[numeric_columns + ['yield']].corr()['yield'].drop('yield')
+        # Correlate each factor with yield only, rather than building the full matrix
+        X = data[numeric_columns].to_numpy(dtype=np.float64)
+        y = data['yield'].to_numpy(dtype=np.float64)
+        Xc = X - X.mean(axis=0)
+        yc = y - y.mean()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = (Xc.T @ yc) / np.sqrt((Xc * Xc).sum(axis=0) * (yc @ yc))
+        correlations = pd.Series(r, index=numeric_columns)
         
         # Top positive and negative correlations
         positive_factors = correlations[correlations > 0].sort_values(ascending=False)
@@ -155,11 +268,11 @@ class YieldGapAnalyzer:
     def _calculate_percentile_rank(self, user_yield: float, crop: str, state: str, season: str = None) -> float:
         """Calculate where user's yield ranks among all records."""
         
-        data = self.data_loader.filter_data(crop=crop, state=state, season=season)
-        if data.empty:
+        yields = self.data_loader.get_sorted_yields(crop, state, season)
+        if yields is None or len(yields) == 0:
             return 0.0
             
-        rank = (data['yield'] < user_yield).mean() * 100
+        rank = np.searchsorted(yields, user_yield, side='left') / len(yields) * 100
         return round(rank, 1)
     
     def _calculate_improvement_potential(self, user_yield: float, benchmarks: Dict) -> Dict:
@@ -189,34 +302,33 @@ class YieldGapAnalyzer:
         
         return potential
     
-    def _generate_recommendations(self, user_yield: float, benchmarks: Dict, crop: str, state: str, season: str) -> List[str]:
-        """Generate specific recommendations based on yield gap analysis."""
-        
-        recommendations = []
+    def _generate_recommendations(self, user_yield: float, benchmarks: Dict, crop: str, state: str, season: str) -> List[Tuple[int, str]]:
+        """Generate (severity, text) recommendations based on yield gap analysis."""
         
         # Performance assessment
         if user_yield >= benchmarks['top_10_percent']:
-            recommendations.append("🏆 Excellent! You're already in the top 10% of performers.")
+            severity = 0
         elif user_yield >= benchmarks['top_25_percent']:
-            recommendations.append("👍 Good performance! You're in the top 25% range.")
+            severity = 1
         elif user_yield >= benchmarks['average_yield']:
-            recommendations.append("📈 Above average, but room for improvement.")
+            severity = 2
         else:
-            recommendations.append("🎯 Significant improvement potential identified.")
+            severity = 3
+        recommendations = [(severity, PERFORMANCE_ASSESSMENTS[severity])]
         
         # Specific improvement suggestions
         improvement_factors = benchmarks['improvement_factors']
         
         if improvement_factors['key_insights']:
-            recommendations.extend(improvement_factors['key_insights'])
+            recommendations.extend((ADVICE_SEVERITY, insight) for insight in improvement_factors['key_insights'])
         
         # High performer characteristics
         if 'consistent_high_performers' in benchmarks:
             char = benchmarks['consistent_high_performers']['characteristics']
             if 'avg_fertilizer' in char:
-                recommendations.append(f"💡 Top performers use ~{char['avg_fertilizer']:.0f} kg/ha fertilizer on average")
+                recommendations.append((ADVICE_SEVERITY, f"💡 Top performers use ~{char['avg_fertilizer']:.0f} kg/ha fertilizer on average"))
             if 'optimal_pH' in char:
-                recommendations.append(f"🌱 Optimal soil conditions: pH {char['optimal_pH']}, N:{char['optimal_N']:.0f}, P:{char['optimal_P']:.0f}, K:{char['optimal_K']:.0f}")
+                recommendations.append((ADVICE_SEVERITY, f"🌱 Optimal soil conditions: pH {char['optimal_pH']}, N:{char['optimal_N']:.0f}, P:{char['optimal_P']:.0f}, K:{char['optimal_K']:.0f}"))
         
         return recommendations
     
@@ -228,17 +340,22 @@ class YieldGapAnalyzer:
             return {'error': 'No data available for visualization'}
         
         benchmarks = self.calculate_yield_benchmarks(crop, state, season)
+        years, yearly_average = self.data_loader.get_yearly_trend(crop, state, season)
         
+        # Arrays rather than Python lists/dicts - plotting accepts them as-is
         viz_data = {
             'user_yield': user_yield,
-            'yield_distribution': data['yield'].tolist(),
+            'yield_distribution': data['yield'].to_numpy(dtype=np.float32),
             'benchmarks': {
                 'average': benchmarks['average_yield'],
                 'top_25': benchmarks['top_25_percent'],
                 'top_10': benchmarks['top_10_percent'],
                 'maximum': benchmarks['max_yield_achieved']
             },
-            'yearly_trend': data.groupby('year')['yield'].mean().to_dict(),
+            'yearly_trend': {
+                'years': years,
+                'average_yield': yearly_average
+            },
             'percentile_rank': self._calculate_percentile_rank(user_yield, crop, state, season)
         }
         
@@ -0,0 +1,23 @@
+"""
+FasalMitra Web Launcher
+
+Starts the Streamlit web app in the current Python process.
+Works the same on Windows, macOS and Linux - no streamlit executable lookup needed.
+"""
+
+import sys
+from pathlib import Path
+
+from streamlit.web import cli as stcli
+
+APP_PATH = Path(__file__).parent / "src" / "ui" / "fasal_mitra_app.py"
+
+
+def main():
+    """Run the FasalMitra Streamlit app; extra arguments are passed through to Streamlit."""
+    sys.argv = ["streamlit", "run", str(APP_PATH), *sys.argv[1:]]
+    return stcli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
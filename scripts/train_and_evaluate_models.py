@@ -40,10 +40,6 @@ class ModelEvaluator:
         
     def load_and_prepare_data(self):
         """Load and prepare data for model training."""
-        print("📊 Loading datasets...")
-        self.data_loader.load_datasets()
-        self.data_loader.merge_datasets()
-        
         data = self.data_loader.merged_data.dropna()
         print(f"✅ Loaded {len(data):,} records")
         
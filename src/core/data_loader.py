@@ -8,16 +8,103 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import os
+import json
+import hashlib
+import tempfile
+
+try:
+    import pyarrow.feather as feather  # Also enables the parquet snapshot cache
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Merged-dataset cache shared by every process on the machine; /dev/shm keeps
+# it in memory where available
+SHARED_CACHE_DIR = Path('/dev/shm') if Path('/dev/shm').is_dir() else Path(tempfile.gettempdir())
+
+def quantile_from_sorted(sorted_values, q):
+    """Read a quantile off an ascending array by index (linear, like np.percentile)."""
+    position = q * (len(sorted_values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def quantile_by_selection(values, q):
+    """Same as quantile_from_sorted for an unsorted array, selecting the two neighbours in O(n)."""
+    position = q * (len(values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    low_value, high_value = np.partition(values, (lower, upper))[[lower, upper]]
+    return low_value + (high_value - low_value) * (position - lower)
+
+def _raw_dataset(attr, doc):
+    """Property for a raw dataset, read from disk on first access if it isn't loaded yet."""
+    def get(self):
+        if getattr(self, attr) is None:
+            self.load_datasets()
+        return getattr(self, attr)
+    
+    def set(self, value):
+        setattr(self, attr, value)
+    
+    return property(get, set, doc=doc)
+
 
 class DataLoader:
     """Centralized data loading and preprocessing for farming advisory system."""
     
-    def __init__(self, data_dir=".."):  # Look in parent directory by default
-        self.data_dir = Path(__file__).parent.parent.parent / data_dir if data_dir == ".." else Path(data_dir)
-        self.crop_data = None
-        self.soil_data = None
-        self.weather_data = None
+    # Column dtypes applied at load time; single precision is plenty for the
+    # statistics computed here and halves the memory each pass reads
+    CROP_DTYPES = {
+        'crop': 'category',
+        'state': 'category',
+        'season': 'category',
+        'area': 'float32',
+        'fertilizer': 'float32',
+        'pesticide': 'float32',
+        'yield': 'float32'
+    }
+    WEATHER_DTYPES = {
+        'avg_temp_c': 'float32',
+        'total_rainfall_mm': 'float32',
+        'avg_humidity_percent': 'float32'
+    }
+    SOIL_DTYPES = {'N': 'float32', 'P': 'float32', 'K': 'float32', 'pH': 'float32'}
+    
+    # Yield percentile at or above which a record counts as a high performer
+    HIGH_PERFORMER_PERCENTILE = 80
+    
+    # The raw datasets; skipped when the merged data comes from the shared
+    # cache, so they are read on first access in that case
+    crop_data = _raw_dataset('_crop_data', "Crop yield records.")
+    soil_data = _raw_dataset('_soil_data', "Soil nutrients by state.")
+    weather_data = _raw_dataset('_weather_data', "Weather by state and year.")
+    
+    def __init__(self, data_dir=".."):  # Project root by default
+        self.data_dir = Path(__file__).parent.parent.parent if data_dir == ".." else Path(data_dir)
+        self._crop_data = None
+        self._soil_data = None
+        self._weather_data = None
         self.merged_data = None
+        self.data_version = 0  # Bumped on every merge; invalidates cached lookups
+        self._filter_cache = {}
+        self._histogram_cache = {}
+        self.benchmarks_table = None
+        self.crop_state_benchmarks = None
+        self._group_positions = {}
+        self._crop_state_positions = {}
+        self._seasons_by_crop_state = {}
+        self._crop_list = []
+        self._state_list = []
+        self._season_list = []
+        self.sorted_yields = {}
+        self.high_performer_positions = {}
+        self.yearly_trends = {}
+        
+        # Load the merged data up front so its accessors never need a lazy-load check
+        if not self._load_shared_merged():
+            self.load_datasets()
+            self.merge_datasets()
         
     def load_datasets(self):
         """Load all three core datasets."""
@@ -26,7 +113,9 @@ class DataLoader:
         # Load crop yield data
         crop_file = self.data_dir / "data/raw/crop_yield.csv"
         if crop_file.exists():
-            self.crop_data = pd.read_csv(crop_file)
+            self.crop_data = self._read_csv_cached(crop_file, self.CROP_DTYPES)
+            # Strip season padding once so no lookup has to per call
+            self.crop_data['season'] = self.crop_data['season'].str.strip().astype('category')
             print(f"✅ Loaded crop data: {len(self.crop_data):,} records")
         else:
             raise FileNotFoundError(f"Crop yield data not found: {crop_file}")
@@ -34,7 +123,7 @@ class DataLoader:
         # Load soil data
         soil_file = self.data_dir / "data/raw/state_soil_data.csv"
         if soil_file.exists():
-            self.soil_data = pd.read_csv(soil_file)
+            self.soil_data = self._read_csv_cached(soil_file, self.SOIL_DTYPES)
             print(f"✅ Loaded soil data: {len(self.soil_data):,} records")
         else:
             raise FileNotFoundError(f"Soil data not found: {soil_file}")
@@ -42,16 +131,105 @@ class DataLoader:
         # Load weather data
         weather_file = self.data_dir / "data/raw/state_weather_data_1997_2020.csv"
         if weather_file.exists():
-            self.weather_data = pd.read_csv(weather_file)
+            self.weather_data = self._read_csv_cached(weather_file, self.WEATHER_DTYPES)
             print(f"✅ Loaded weather data: {len(self.weather_data):,} records")
         else:
             raise FileNotFoundError(f"Weather data not found: {weather_file}")
     
+    def _read_csv_cached(self, csv_file, dtype):
+        """Read a CSV through a parquet snapshot kept next to it.
+        
+        The snapshot is rebuilt whenever the CSV's modification time or the
+        requested dtypes change. Without pyarrow the CSV is parsed directly.
+        """
+        if not PYARROW_AVAILABLE:
+            return pd.read_csv(csv_file, dtype=dtype)
+            
+        parquet_file = csv_file.with_suffix('.parquet')
+        meta_file = csv_file.with_suffix('.meta.json')
+        meta = {'csv_mtime': csv_file.stat().st_mtime, 'dtype': dtype}
+        
+        if parquet_file.exists() and meta_file.exists():
+            try:
+                if json.loads(meta_file.read_text()) == meta:
+                    return pd.read_parquet(parquet_file, engine='pyarrow', memory_map=True)
+            except (OSError, ValueError):
+                pass  # Unreadable snapshot - rebuild it below
+                
+        data = pd.read_csv(csv_file, dtype=dtype, engine='pyarrow')
+        
+        try:
+            data.to_parquet(parquet_file, engine='pyarrow', compression='zstd')
+            meta_file.write_text(json.dumps(meta))
+        except OSError:
+            pass  # Read-only data directory - just skip caching
+            
+        return data
+    
+    def _source_files(self):
+        """Paths of the raw CSVs the merged dataset is built from."""
+        return [
+            self.data_dir / "data/raw/crop_yield.csv",
+            self.data_dir / "data/raw/state_soil_data.csv",
+            self.data_dir / "data/raw/state_weather_data_1997_2020.csv"
+        ]
+    
+    def source_signature(self):
+        """Map each existing raw CSV to its modification time; changes whenever the source data does."""
+        return {str(path): path.stat().st_mtime for path in self._source_files() if path.exists()}
+    
+    def _shared_merged_paths(self):
+        """Feather file and metadata for this data directory's shared merged cache."""
+        digest = hashlib.md5(str(self.data_dir.resolve()).encode()).hexdigest()[:12]
+        feather_file = SHARED_CACHE_DIR / f"fasal_merged_{digest}.feather"
+        meta = {
+            'sources': self.source_signature(),
+            'dtypes': [self.CROP_DTYPES, self.WEATHER_DTYPES, self.SOIL_DTYPES]
+        }
+        return feather_file, feather_file.with_suffix('.meta.json'), meta
+    
+    def _load_shared_merged(self):
+        """Adopt a merged dataset another process already built; returns success."""
+        if not PYARROW_AVAILABLE or not all(path.exists() for path in self._source_files()):
+            return False
+            
+        feather_file, meta_file, meta = self._shared_merged_paths()
+        try:
+            if json.loads(meta_file.read_text()) != meta:
+                return False
+            merged = feather.read_table(feather_file, memory_map=True).to_pandas()
+        except (OSError, ValueError):
+            return False
+            
+        print(f"✅ Loaded merged dataset from shared cache: {len(merged):,} records")
+        self._set_merged_data(merged)
+        return True
+    
+    def _save_shared_merged(self):
+        """Publish the merged dataset for other processes; best effort."""
+        if not PYARROW_AVAILABLE:
+            return
+            
+        feather_file, meta_file, meta = self._shared_merged_paths()
+        temp_file = feather_file.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            self.merged_data.to_feather(temp_file)
+            os.replace(temp_file, feather_file)  # Atomic, so readers never see a partial file
+            meta_file.write_text(json.dumps(meta))
+        except OSError:
+            temp_file.unlink(missing_ok=True)
+    
+    def _set_merged_data(self, merged):
+        """Install a merged dataset and rebuild everything derived from it."""
+        self.merged_data = merged
+        self.data_version += 1
+        self._filter_cache = {}
+        self._histogram_cache = {}
+        self._build_group_index()
+        self.precompute_benchmarks()
+    
     def merge_datasets(self):
         """Merge all datasets into one master dataset for ML."""
-        if not all([self.crop_data is not None, self.soil_data is not None, self.weather_data is not None]):
-            self.load_datasets()
-            
         print("Merging datasets...")
         
         # Merge crop with weather (on state + year)
@@ -68,7 +246,15 @@ class DataLoader:
             how='left'
         )
         
-        self.merged_data = merged
+        merged['state'] = merged['state'].astype('category')
+        
+        # Merging can upcast (e.g. when a key has no match), so re-apply float32
+        float_columns = [col for dtypes in (self.CROP_DTYPES, self.WEATHER_DTYPES, self.SOIL_DTYPES)
+                         for col, dtype in dtypes.items() if dtype == 'float32']
+        merged = merged.astype({col: 'float32' for col in float_columns})
+        
+        self._set_merged_data(merged)
+        self._save_shared_merged()
         print(f"✅ Merged dataset: {len(merged):,} records")
         
         # Check for missing values
@@ -80,29 +266,139 @@ class DataLoader:
             
         return merged
     
+    def _build_group_index(self):
+        """Map each crop-state(-season) key to its row positions in merged_data."""
+        self._group_positions = self.merged_data.groupby(['crop', 'state', 'season'], sort=False, observed=True).indices
+        self._crop_state_positions = self.merged_data.groupby(['crop', 'state'], sort=False, observed=True).indices
+        
+        # Seasons recorded for each crop-state pair, in order of first appearance
+        self._seasons_by_crop_state = {}
+        first_seen = sorted(self._group_positions.items(), key=lambda item: item[1][0])
+        for (crop, state, season), _ in first_seen:
+            self._seasons_by_crop_state.setdefault((crop, state), []).append(season)
+        
+        # Sorted option lists for the UI selectboxes
+        self._crop_list = sorted(self.merged_data['crop'].unique())
+        self._state_list = sorted(self.merged_data['state'].unique())
+        self._season_list = sorted(self.merged_data['season'].cat.categories)
+    
+    def precompute_benchmarks(self):
+        """Precompute yield statistics for every crop-state(-season) group."""
+        self.benchmarks_table = self._aggregate_yield_stats(['crop', 'state', 'season'])
+        self.crop_state_benchmarks = self._aggregate_yield_stats(['crop', 'state'])
+        
+        # Ascending yields and high-performer rows per group, so ranking and
+        # top-performer analysis need no per-call sort or scan
+        yields = self.merged_data['yield'].to_numpy()
+        self.sorted_yields = {}
+        self.high_performer_positions = {}
+        
+        for groups in (self._group_positions, self._crop_state_positions):
+            for key, positions in groups.items():
+                group_yields = yields[positions]
+                sorted_yields = np.sort(group_yields)
+                threshold = quantile_from_sorted(sorted_yields, self.HIGH_PERFORMER_PERCENTILE / 100)
+                
+                self.sorted_yields[key] = sorted_yields
+                self.high_performer_positions[key] = positions[group_yields >= threshold]
+        
+        # Year-by-year average yield per group for trend charts
+        self.yearly_trends = {}
+        for keys in (['crop', 'state', 'season'], ['crop', 'state']):
+            self.yearly_trends.update(self._aggregate_yearly_trends(keys))
+    
+    def _aggregate_yearly_trends(self, keys):
+        """Map each group to its (years, average yield) arrays, sorted by year."""
+        yearly_mean = self.merged_data.groupby(keys + ['year'], sort=True, observed=True)['yield'].mean()
+        
+        trends = {}
+        for key, group in yearly_mean.groupby(level=keys, sort=False, observed=True):
+            trends[key] = (
+                group.index.get_level_values('year').to_numpy(dtype=np.int16),
+                group.to_numpy(dtype=np.float32)
+            )
+        return trends
+    
+    def _aggregate_yield_stats(self, keys):
+        """Aggregate yield statistics per group in a single groupby pass."""
+        grouped = self.merged_data.groupby(keys, sort=False, observed=True)
+        
+        stats = grouped.agg(
+            avg=('yield', 'mean'),
+            mx=('yield', 'max'),
+            mn=('yield', 'min'),
+            n=('yield', 'size'),
+            year_min=('year', 'min'),
+            year_max=('year', 'max')
+        )
+        stats['std'] = grouped['yield'].std(ddof=0)
+        
+        # Median and percentiles from a single quantile pass
+        quantiles = grouped['yield'].quantile([0.25, 0.5, 0.75, 0.9]).unstack()
+        quantiles.columns = ['p25', 'med', 'p75', 'p90']
+        
+        # Report statistics in double precision even though inputs are float32
+        return stats.join(quantiles).astype('float64')
+    
+    def get_benchmark_stats(self, crop, state, season=None):
+        """Get precomputed yield statistics for a group, or None if it has no records."""
+        if season:
+            table, key = self.benchmarks_table, (crop, state, season.strip())
+        else:
+            table, key = self.crop_state_benchmarks, (crop, state)
+            
+        try:
+            return table.loc[key]
+        except KeyError:
+            return None
+    
+    def get_sorted_yields(self, crop, state, season=None):
+        """Get the ascending yield array for a group, or None if it has no records."""
+        key = (crop, state, season.strip()) if season else (crop, state)
+        return self.sorted_yields.get(key)
+    
+    def get_yield_histogram(self, crop, state, season=None, bins=30):
+        """Get the (counts, bin_edges) yield histogram for a group, or None if it has no records."""
+        key = (crop, state, season.strip() if season else None, bins)
+        histogram = self._histogram_cache.get(key)
+        if histogram is None:
+            yields = self.get_sorted_yields(crop, state, season)
+            if yields is None:
+                return None
+            histogram = self._histogram_cache[key] = np.histogram(yields, bins=bins)
+        return histogram
+    
+    def seasons_for(self, crop, state):
+        """Get the seasons with records for a crop in a state."""
+        return list(self._seasons_by_crop_state.get((crop, state), []))
+    
+    def get_yearly_trend(self, crop, state, season=None):
+        """Get the (years, average yield) arrays for a group, or None if it has no records."""
+        key = (crop, state, season.strip()) if season else (crop, state)
+        return self.yearly_trends.get(key)
+    
+    def get_high_performers(self, crop, state, season=None):
+        """Get the records at or above the group's high-performer threshold, or None."""
+        key = (crop, state, season.strip()) if season else (crop, state)
+        positions = self.high_performer_positions.get(key)
+        if positions is None:
+            return None
+        return self.merged_data.iloc[positions]
+    
     def get_crop_list(self):
         """Get list of all available crops."""
-        if self.crop_data is None:
-            self.load_datasets()
-        return sorted(self.crop_data['crop'].unique())
+        return list(self._crop_list)
     
     def get_state_list(self):
         """Get list of all available states."""
-        if self.crop_data is None:
-            self.load_datasets()
-        return sorted(self.crop_data['state'].unique())
+        return list(self._state_list)
     
     def get_season_list(self):
         """Get list of all available seasons."""
-        if self.crop_data is None:
-            self.load_datasets()
-        return sorted(self.crop_data['season'].str.strip().unique())
+        return list(self._season_list)
     
     def get_data_summary(self):
         """Get summary statistics of the dataset."""
-        if self.merged_data is None:
-            self.merge_datasets()
-            
         return {
             'total_records': len(self.merged_data),
             'crops': self.merged_data['crop'].nunique(),
@@ -114,25 +410,62 @@ class DataLoader:
         }
     
     def filter_data(self, crop=None, state=None, season=None, years=None):
-        """Filter merged dataset based on criteria."""
-        if self.merged_data is None:
-            self.merge_datasets()
+        """Filter merged dataset based on criteria.
+        
+        Crop-state(-season) queries resolve through a hash lookup of row
+        positions built at merge time; the resulting positions are cached per
+        filter combination.
+        """
+        key = (
+            crop or None,
+            state or None,
+            season.strip() if season else None,
+            tuple(years) if isinstance(years, (list, tuple)) else years
+        )
+        positions = self._filter_cache.get(key)
+        
+        if positions is None:
+            positions = self._match_positions(crop, state, season)
             
-        data = self.merged_data.copy()
+            if years:
+                year = self.merged_data['year'].to_numpy()[positions]
+                if isinstance(years, (list, tuple)):
+                    positions = positions[(year >= years[0]) & (year <= years[1])]
+                else:
+                    positions = positions[year == years]
+            
+            self._filter_cache[key] = positions
+                
+        return self.merged_data.iloc[positions]
+    
+    def _match_positions(self, crop=None, state=None, season=None):
+        """Get row positions matching the crop/state/season criteria."""
+        if crop and state:
+            if season:
+                groups, group_key = self._group_positions, (crop, state, season.strip())
+            else:
+                groups, group_key = self._crop_state_positions, (crop, state)
+            return groups.get(group_key, np.empty(0, dtype=np.intp))
+        
+        # Partial keys fall back to a mask scan
+        data = self.merged_data
+        mask = np.ones(len(data), dtype=bool)
         
         if crop:
-            data = data[data['crop'] == crop]
+            mask &= (data['crop'] == crop).to_numpy()
         if state:
-            data = data[data['state'] == state]
+            mask &= (data['state'] == state).to_numpy()
         if season:
-            data = data[data['season'].str.strip() == season.strip()]
-        if years:
-            if isinstance(years, (list, tuple)):
-                data = data[data['year'].between(years[0], years[1])]
-            else:
-                data = data[data['year'] == years]
-                
-        return data
+            mask &= (data['season'] == season.strip()).to_numpy()
+            
+        return np.flatnonzero(mask)
+
+# Shared instance, created on first use
+_data_loader = None
 
-# Global instance
-data_loader = DataLoader()
\ No newline at end of file
+def get_data_loader():
+    """Get the shared DataLoader, loading the datasets on first call."""
+    global _data_loader
+    if _data_loader is None:
+        _data_loader = DataLoader()
+    return _data_loader
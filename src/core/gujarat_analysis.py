@@ -5,30 +5,62 @@ Integrates Gujarat Foodgrains and Oilseeds data with existing system
 
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import LabelEncoder
+import joblib
+import sklearn
+from sklearn.ensemble import HistGradientBoostingRegressor
+import hashlib
+import logging
 import warnings
+from functools import lru_cache
+from pathlib import Path
 warnings.filterwarnings('ignore')
 
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401 - enables pandas' multithreaded CSV engine
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+CSV_ENGINE = 'pyarrow' if PYARROW_AVAILABLE else 'c'
+
+# Saved Gujarat model in the repository's models/ folder, reused while the
+# training data and model settings are unchanged
+MODEL_PATH = Path(__file__).resolve().parent.parent.parent / 'models' / 'gujarat_model.joblib'
+
+# Foodgrain crop groups used to categorize the Gujarat foodgrains data
+CEREALS = frozenset(['Rice', 'Wheat', 'Jowar', 'Bajra', 'Maize', 'Ragi', 'Small Millets'])
+PULSES = frozenset(['Tur (Red Gram)', 'Udad', 'Mung (Green Gram)', 'Math', 'Gram', 'Other Pulses'])
+
 class GujaratDataLoader:
     """Load and process Gujarat-specific datasets"""
     
+    # Columns read from each CSV, spelled as in the file headers (some carry a trailing space)
+    FOODGRAINS_COLUMNS = ['Sr. No.', 'Crop', 'Area', 'Production', 'Yield ']
+    OILSEEDS_COLUMNS = ['Sr. No. ', 'Crops', 'Area', 'Production', 'Yield ']
+    
     def __init__(self):
         self.foodgrains = None
         self.oilseeds = None
         self.combined_gujarat = None
+        self._crop_index = {}
         
     def load_gujarat_data(self):
         """Load Gujarat-specific datasets"""
-        print("📂 Loading Gujarat-specific datasets...")
+        logger.info("📂 Loading Gujarat-specific datasets...")
         
         # Load foodgrains data
-        self.foodgrains = pd.read_csv('data/gujarat/Foodgrains1.csv')
-        print(f"✅ Loaded Gujarat Foodgrains: {len(self.foodgrains)} records")
+        self.foodgrains = pd.read_csv(
+            'data/gujarat/Foodgrains1.csv', usecols=self.FOODGRAINS_COLUMNS, engine=CSV_ENGINE
+        )
+        logger.info("✅ Loaded Gujarat Foodgrains: %d records", len(self.foodgrains))
         
         # Load oilseeds data
-        self.oilseeds = pd.read_csv('data/gujarat/oilseeds1.csv')
-        print(f"✅ Loaded Gujarat Oilseeds: {len(self.oilseeds)} records")
+        self.oilseeds = pd.read_csv(
+            'data/gujarat/oilseeds1.csv', usecols=self.OILSEEDS_COLUMNS, engine=CSV_ENGINE
+        )
+        logger.info("✅ Loaded Gujarat Oilseeds: %d records", len(self.oilseeds))
         
         # Clean and standardize data
         self._clean_data()
@@ -45,65 +77,70 @@ class GujaratDataLoader:
         self.foodgrains['Crop'] = self.foodgrains['Crop'].str.strip()
         
         # Remove summary rows
-        self.foodgrains = self.foodgrains[~self.foodgrains['Crop'].str.contains('Total', na=False)]
+        self.foodgrains = self.foodgrains[~self.foodgrains['Crop'].str.contains('Total', na=False, regex=False)]
         self.foodgrains = self.foodgrains.dropna(subset=['Sr. No.'])
         
         # Clean oilseeds
         self.oilseeds.columns = self.oilseeds.columns.str.strip()
         self.oilseeds['Crops'] = self.oilseeds['Crops'].str.strip()
-        self.oilseeds = self.oilseeds[~self.oilseeds['Crops'].str.contains('Total', na=False)]
+        self.oilseeds = self.oilseeds[~self.oilseeds['Crops'].str.contains('Total', na=False, regex=False)]
         self.oilseeds = self.oilseeds.dropna(subset=['Sr. No.'])
         
         # Rename for consistency
         self.oilseeds.rename(columns={'Crops': 'Crop'}, inplace=True)
         
+        # Downcast numeric columns; the figures only carry two decimals
+        for df in (self.foodgrains, self.oilseeds):
+            for col in ['Area', 'Production', 'Yield']:
+                df[col] = pd.to_numeric(df[col], errors='coerce', downcast='float')
+            df['Sr. No.'] = pd.to_numeric(df['Sr. No.'], errors='coerce', downcast='integer')
+        
     def _combine_datasets(self):
         """Combine foodgrains and oilseeds into single Gujarat dataset"""
         # Add crop category
-        self.foodgrains['Category'] = self.foodgrains['Crop'].apply(self._categorize_foodgrain)
+        crops = self.foodgrains['Crop']
+        self.foodgrains['Category'] = np.select(
+            [crops.isin(CEREALS), crops.isin(PULSES)],
+            ['Cereals', 'Pulses'],
+            default='Other Foodgrains'
+        )
         self.oilseeds['Category'] = 'Oilseeds'
         
-        # Combine
-        self.combined_gujarat = pd.concat([self.foodgrains, self.oilseeds], ignore_index=True)
-        
-        # Add state column
-        self.combined_gujarat['State'] = 'Gujarat'
+        # Combine, standardize column names to match main dataset and add state column
+        self.combined_gujarat = (
+            pd.concat([self.foodgrains, self.oilseeds], ignore_index=True)
+            .rename(columns={
+                'Area': 'area_gujarat',
+                'Production': 'production_gujarat',
+                'Yield': 'yield_gujarat'
+            })
+            .assign(State='Gujarat')
+        )
         
-        # Standardize column names to match main dataset
-        self.combined_gujarat.rename(columns={
-            'Area': 'area_gujarat',
-            'Production': 'production_gujarat', 
-            'Yield': 'yield_gujarat'
-        }, inplace=True)
+        # Low-cardinality labels as categoricals: integer codes instead of one string per row
+        for col in ['Crop', 'Category', 'State']:
+            self.combined_gujarat[col] = self.combined_gujarat[col].astype('category')
         
-        print(f"✅ Combined Gujarat dataset: {len(self.combined_gujarat)} crops")
+        # One row per crop for constant-time stats lookups (first entry wins)
+        unique_crops = self.combined_gujarat.drop_duplicates('Crop')
+        self._crop_index = {row.Crop: row for row in unique_crops.itertuples(index=False)}
         
-    def _categorize_foodgrain(self, crop):
-        """Categorize foodgrain crops"""
-        cereals = ['Rice', 'Wheat', 'Jowar', 'Bajra', 'Maize', 'Ragi', 'Small Millets']
-        pulses = ['Tur (Red Gram)', 'Udad', 'Mung (Green Gram)', 'Math', 'Gram', 'Other Pulses']
+        logger.info("✅ Combined Gujarat dataset: %d crops", len(self.combined_gujarat))
         
-        if crop in cereals:
-            return 'Cereals'
-        elif crop in pulses:
-            return 'Pulses'
-        else:
-            return 'Other Foodgrains'
-    
     def get_crop_stats(self, crop_name):
         """Get statistics for a specific crop in Gujarat"""
-        crop_data = self.combined_gujarat[self.combined_gujarat['Crop'] == crop_name]
+        row = self._crop_index.get(crop_name)
         
-        if crop_data.empty:
+        if row is None:
             return None
         
         return {
             'crop': crop_name,
             'state': 'Gujarat',
-            'area': float(crop_data['area_gujarat'].values[0]),
-            'production': float(crop_data['production_gujarat'].values[0]),
-            'yield': float(crop_data['yield_gujarat'].values[0]),
-            'category': crop_data['Category'].values[0]
+            'area': round(float(row.area_gujarat), 2),
+            'production': round(float(row.production_gujarat), 2),
+            'yield': round(float(row.yield_gujarat), 2),
+            'category': row.Category
         }
     
     def get_all_crops(self):
@@ -112,13 +149,13 @@ class GujaratDataLoader:
     
     def get_category_summary(self):
         """Get summary statistics by crop category"""
-        summary = self.combined_gujarat.groupby('Category').agg({
+        summary = self.combined_gujarat.groupby('Category', observed=True).agg({
             'area_gujarat': 'sum',
             'production_gujarat': 'sum',
             'yield_gujarat': 'mean'
-        }).round(2)
+        }).astype('float64').round(2)  # Report in double precision even though columns are float32
         
-        summary['crop_count'] = self.combined_gujarat.groupby('Category').size()
+        summary['crop_count'] = self.combined_gujarat.groupby('Category', observed=True).size()
         
         return summary
 
@@ -126,22 +163,44 @@ class GujaratDataLoader:
 class GujaratEnhancedPredictor:
     """Enhanced predictor with Gujarat-specific data integration"""
     
+    # Weather, soil and input columns filled with Gujarat averages at prediction time
+    CONTEXT_FEATURES = ['pesticide', 'avg_temp_c', 'total_rainfall_mm', 'avg_humidity_percent',
+                        'N', 'P', 'K', 'pH']
+    
+    # Gradient boosting settings; saved with the model and checked before reusing it
+    MODEL_PARAMS = {'max_iter': 200, 'max_depth': 8, 'learning_rate': 0.1, 'random_state': 42}
+    
     def __init__(self, main_data_loader, gujarat_loader):
         self.main_data = main_data_loader
         self.gujarat_data = gujarat_loader
         self.model = None
         self.label_encoders = {}
+        self.feature_names = []
+        self._feature_idx = {}
+        self._gujarat_slice = None
+        self._gujarat_mean = None
+    
+    def _ensure_gujarat_cache(self):
+        """Cache the Gujarat rows of the main dataset and their context averages"""
+        if self._gujarat_slice is None:
+            merged = self.main_data.merged_data
+            self._gujarat_slice = merged[merged['state'] == 'Gujarat'].copy()
+            self._gujarat_mean = self._gujarat_slice[self.CONTEXT_FEATURES].mean().to_dict()
+    
+    def clear_cache(self):
+        """Drop cached Gujarat data; call after the main dataset changes"""
+        self._gujarat_slice = None
+        self._gujarat_mean = None
         
     def prepare_gujarat_enhanced_dataset(self):
         """Merge main dataset with Gujarat-specific data"""
-        print("\n🔄 Preparing Gujarat-enhanced dataset...")
+        logger.info("🔄 Preparing Gujarat-enhanced dataset...")
         
         # Get main data for Gujarat
-        gujarat_main = self.main_data.merged_data[
-            self.main_data.merged_data['state'] == 'Gujarat'
-        ].copy()
+        self._ensure_gujarat_cache()
+        gujarat_main = self._gujarat_slice.copy()
         
-        print(f"Main dataset - Gujarat records: {len(gujarat_main)}")
+        logger.info("Main dataset - Gujarat records: %d", len(gujarat_main))
         
         # Standardize crop names for merging
         gujarat_main['crop_clean'] = gujarat_main['crop'].str.strip().str.title()
@@ -149,22 +208,28 @@ class GujaratEnhancedPredictor:
             self.gujarat_data.combined_gujarat['Crop'].str.strip().str.title()
         )
         
+        # One row per crop so the merge cannot fan out main-dataset records
+        gujarat_crops = self.gujarat_data.combined_gujarat.groupby('crop_clean', as_index=False).agg({
+            'yield_gujarat': 'mean',
+            'Category': 'first'
+        })
+        
         # Merge datasets
         enhanced = gujarat_main.merge(
-            self.gujarat_data.combined_gujarat[['crop_clean', 'yield_gujarat', 'Category']],
+            gujarat_crops,
             on='crop_clean',
-            how='left'
+            how='left',
+            validate='many_to_one'
         )
         
-        print(f"✅ Enhanced dataset created: {len(enhanced)} records")
-        print(f"   Records with Gujarat-specific data: {enhanced['yield_gujarat'].notna().sum()}")
+        logger.info("✅ Enhanced dataset created: %d records", len(enhanced))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("   Records with Gujarat-specific data: %d", enhanced['yield_gujarat'].notna().sum())
         
         return enhanced
     
-    def train_gujarat_specific_model(self):
-        """Train model specifically optimized for Gujarat"""
-        print("\n🧠 Training Gujarat-specific ML model...")
-        
+    def _build_training_data(self):
+        """Build the encoded float32 feature matrix and target for the Gujarat model"""
         enhanced_data = self.prepare_gujarat_enhanced_dataset()
         
         # Features for prediction
@@ -183,100 +248,148 @@ class GujaratEnhancedPredictor:
         X = enhanced_data[all_features].copy()
         y = enhanced_data['yield'].values
         
-        # Encode categorical variables
+        # Encode categorical variables; the sorted categories double as the encoder
         for col in categorical_features:
-            le = LabelEncoder()
-            X[col] = le.fit_transform(X[col].astype(str))
-            self.label_encoders[col] = le
-        
-        # Train model
-        self.model = RandomForestRegressor(
-            n_estimators=200,  # More trees for Gujarat-specific model
-            max_depth=20,
-            min_samples_split=3,
-            min_samples_leaf=2,
-            random_state=42,
-            n_jobs=-1
+            categories = pd.Categorical(X[col].astype(str))
+            X[col] = categories.codes
+            self.label_encoders[col] = categories.categories
+        
+        self.feature_names = all_features
+        self._feature_idx = {name: i for i, name in enumerate(all_features)}
+        
+        return np.ascontiguousarray(X.to_numpy(dtype=np.float32)), y
+    
+    def _fit_model(self, X_arr, y):
+        """Fit the Gujarat model on prepared training data and return its R² score"""
+        # Histogram boosting bins every feature once, which suits a few hundred
+        # Gujarat rows better than a deep forest; the encoded crop/season codes
+        # and the Gujarat-data flag are split on as native categories
+        native_categorical = ['crop', 'season', 'has_gujarat_data']
+        
+        self.model = HistGradientBoostingRegressor(
+            **self.MODEL_PARAMS,
+            categorical_features=[self._feature_idx[col] for col in native_categorical]
         )
         
-        self.model.fit(X, y)
+        self.model.fit(X_arr, y)
         
         # Calculate accuracy
-        score = self.model.score(X, y)
-        print(f"✅ Gujarat-specific model trained!")
-        print(f"   Model R² score: {score:.4f}")
+        score = self.model.score(X_arr, y)
+        logger.info("✅ Gujarat-specific model trained!")
+        logger.info("   Model R² score: %.4f", score)
         
-        # Feature importance
-        feature_importance = pd.DataFrame({
-            'feature': all_features,
-            'importance': self.model.feature_importances_
-        }).sort_values('importance', ascending=False)
+        return score
+    
+    def train_gujarat_specific_model(self):
+        """Train model specifically optimized for Gujarat"""
+        logger.info("🧠 Training Gujarat-specific ML model...")
         
-        print("\n📊 Top 5 Important Features for Gujarat:")
-        for idx, row in feature_importance.head(5).iterrows():
-            print(f"   {row['feature']}: {row['importance']:.4f}")
+        X_arr, y = self._build_training_data()
+        return self._fit_model(X_arr, y)
+    
+    def load_or_train_model(self, model_path=MODEL_PATH):
+        """Reuse a saved model trained on identical data, otherwise train and save one"""
+        X_arr, y = self._build_training_data()
+        data_hash = hashlib.md5(X_arr.tobytes() + np.asarray(y).tobytes()).hexdigest()
+        
+        try:
+            bundle = joblib.load(model_path, mmap_mode='r')
+        except Exception:
+            bundle = None  # Missing or unreadable file - retrain below
+        
+        if (isinstance(bundle, dict)
+                and bundle.get('data_hash') == data_hash
+                and bundle.get('sklearn_version') == sklearn.__version__
+                and bundle.get('params') == self.MODEL_PARAMS
+                and bundle.get('features') == self.feature_names):
+            self.model = bundle['model']
+            self.label_encoders = bundle['encoders']
+            logger.info("✅ Loaded saved Gujarat model: %s", model_path)
+            logger.info("   Model R² score: %.4f", bundle['score'])
+            return bundle['score']
+        
+        logger.info("🧠 Training Gujarat-specific ML model...")
+        score = self._fit_model(X_arr, y)
+        
+        try:
+            Path(model_path).parent.mkdir(parents=True, exist_ok=True)
+            joblib.dump({
+                'model': self.model,
+                'encoders': self.label_encoders,
+                'features': self.feature_names,
+                'score': score,
+                'data_hash': data_hash,
+                'sklearn_version': sklearn.__version__,
+                'params': self.MODEL_PARAMS
+            }, model_path)
+        except OSError:
+            pass  # Read-only checkout - keep the in-memory model
         
         return score
     
     def predict_with_gujarat_context(self, crop, season, fertilizer, area=1.0):
         """Make prediction with Gujarat-specific context"""
+        return self.predict_batch([crop], [season], [fertilizer], [area])[0]
+    
+    def predict_batch(self, crops, seasons, fertilizers, areas=None):
+        """Make predictions for many crop/season/fertilizer/area inputs in one model call"""
         
         if self.model is None:
             raise Exception("Model not trained. Call train_gujarat_specific_model() first.")
         
-        # Get Gujarat-specific data for this crop
-        gujarat_stats = self.gujarat_data.get_crop_stats(crop)
+        crops, seasons, fertilizers = list(crops), list(seasons), list(fertilizers)
+        areas = [1.0] * len(crops) if areas is None else list(areas)
+        if not len(crops) == len(seasons) == len(fertilizers) == len(areas):
+            raise ValueError("crops, seasons, fertilizers and areas must have the same length")
+        if not crops:
+            return []
+        
+        # Get Gujarat-specific data for each crop
+        gujarat_stats = [self.gujarat_data.get_crop_stats(crop) for crop in crops]
         
         # Get average weather and soil for Gujarat
-        gujarat_avg = self.main_data.merged_data[
-            self.main_data.merged_data['state'] == 'Gujarat'
-        ].mean()
+        self._ensure_gujarat_cache()
+        gujarat_avg = self._gujarat_mean
         
-        # Prepare input
-        input_data = pd.DataFrame([{
-            'crop': crop,
-            'season': season,
-            'area': area,
-            'fertilizer': fertilizer,
-            'pesticide': gujarat_avg['pesticide'],
-            'avg_temp_c': gujarat_avg['avg_temp_c'],
-            'total_rainfall_mm': gujarat_avg['total_rainfall_mm'],
-            'avg_humidity_percent': gujarat_avg['avg_humidity_percent'],
-            'N': gujarat_avg['N'],
-            'P': gujarat_avg['P'],
-            'K': gujarat_avg['K'],
-            'pH': gujarat_avg['pH'],
-            'has_gujarat_data': 1 if gujarat_stats else 0
-        }])
-        
-        # Encode categorical variables
-        for col in ['crop', 'season']:
-            if col in self.label_encoders:
-                try:
-                    input_data[col] = self.label_encoders[col].transform([input_data[col].values[0]])
-                except:
-                    # If crop not in training data, use most similar
-                    input_data[col] = 0
+        # Fill a float32 feature matrix in training column order
+        idx = self._feature_idx
+        matrix = np.empty((len(crops), len(idx)), dtype=np.float32)
         
-        # Predict
-        prediction = self.model.predict(input_data)[0]
+        for col, values in (('crop', crops), ('season', seasons)):
+            codes = self.label_encoders[col].get_indexer(values)
+            # Values not seen in training fall back to the first category
+            matrix[:, idx[col]] = np.where(codes >= 0, codes, 0)
         
-        result = {
-            'predicted_yield': round(prediction, 2),
-            'crop': crop,
-            'season': season,
-            'fertilizer': fertilizer,
-            'area': area,
-            'has_gujarat_specific_data': gujarat_stats is not None
-        }
+        matrix[:, idx['area']] = areas
+        matrix[:, idx['fertilizer']] = fertilizers
+        for feature in self.CONTEXT_FEATURES:
+            matrix[:, idx[feature]] = gujarat_avg[feature]
+        matrix[:, idx['has_gujarat_data']] = [1 if stats else 0 for stats in gujarat_stats]
         
-        # Add Gujarat benchmark if available
-        if gujarat_stats:
-            result['gujarat_benchmark'] = gujarat_stats['yield']
-            result['vs_gujarat_average'] = round(prediction - gujarat_stats['yield'], 2)
+        # Predict
+        predictions = self.model.predict(matrix)
+        
+        results = []
+        for crop, season, fertilizer, area, stats, prediction in zip(
+            crops, seasons, fertilizers, areas, gujarat_stats, predictions
+        ):
+            result = {
+                'predicted_yield': round(prediction, 2),
+                'crop': crop,
+                'season': season,
+                'fertilizer': fertilizer,
+                'area': area,
+                'has_gujarat_specific_data': stats is not None
+            }
+            
+            # Add Gujarat benchmark if available
+            if stats:
+                result['gujarat_benchmark'] = stats['yield']
+                result['vs_gujarat_average'] = round(prediction - stats['yield'], 2)
+            
+            results.append(result)
         
-        return result
-
+        return results
 
 class GujaratAnalyzer:
     """Comprehensive analysis for Gujarat agriculture"""
@@ -285,8 +398,26 @@ class GujaratAnalyzer:
         self.gujarat_data = gujarat_loader
         self.main_data = main_data_loader
         
+        # Normalize national crop names once and split the national data by crop
+        merged = main_data_loader.merged_data
+        self._crop_key = merged['crop'].str.strip().str.title()
+        self._national_by_crop = dict(list(merged.groupby(self._crop_key, sort=False)))
+        
+        # Ascending national yields per crop, for O(log n) percentile ranks
+        self._sorted_yields_by_crop = {
+            crop: np.sort(national_data['yield'].to_numpy())
+            for crop, national_data in self._national_by_crop.items()
+        }
+        
+        # Per-instance memo; build a new analyzer after reloading data
+        self._compare_cached = lru_cache(maxsize=512)(self._compare_with_national_average)
+        
     def compare_with_national_average(self, crop):
         """Compare Gujarat performance with national average"""
+        return self._compare_cached(crop)
+    
+    def _compare_with_national_average(self, crop):
+        """Build the Gujarat vs national comparison for one crop"""
         
         # Gujarat data
         gujarat_stats = self.gujarat_data.get_crop_stats(crop)
@@ -294,11 +425,9 @@ class GujaratAnalyzer:
             return {'error': f'No Gujarat data for {crop}'}
         
         # National data
-        national_data = self.main_data.merged_data[
-            self.main_data.merged_data['crop'].str.strip().str.title() == crop.title()
-        ]
+        national_data = self._national_by_crop.get(crop.title())
         
-        if national_data.empty:
+        if national_data is None:
             return {'error': f'No national data for {crop}'}
         
         national_avg = national_data['yield'].mean()
@@ -311,7 +440,7 @@ class GujaratAnalyzer:
             'national_max': round(national_max, 2),
             'gujarat_vs_national': round(gujarat_stats['yield'] - national_avg, 2),
             'performance_percentile': self._calculate_percentile(
-                gujarat_stats['yield'], national_data['yield'].values
+                gujarat_stats['yield'], self._sorted_yields_by_crop[crop.title()]
             ),
             'recommendation': self._generate_recommendation(
                 gujarat_stats['yield'], national_avg, national_max
@@ -320,9 +449,10 @@ class GujaratAnalyzer:
         
         return comparison
     
-    def _calculate_percentile(self, value, distribution):
-        """Calculate percentile rank"""
-        return round((distribution < value).sum() / len(distribution) * 100, 1)
+    def _calculate_percentile(self, value, sorted_distribution):
+        """Calculate percentile rank within an ascending distribution"""
+        below = np.searchsorted(sorted_distribution, value, side='left')
+        return round(below / len(sorted_distribution) * 100, 1)
     
     def _generate_recommendation(self, gujarat_yield, national_avg, national_max):
         """Generate recommendation based on comparison"""
@@ -337,26 +467,45 @@ class GujaratAnalyzer:
     
     def get_top_performing_crops(self, top_n=5):
         """Get top performing crops in Gujarat by yield"""
-        top_crops = self.gujarat_data.combined_gujarat.nlargest(top_n, 'yield_gujarat')
+        crops = self.gujarat_data.combined_gujarat
+        yields = crops['yield_gujarat'].to_numpy()
+        top_n = min(top_n, len(yields))
+        if top_n <= 0:
+            return []
         
-        return top_crops[['Crop', 'yield_gujarat', 'Category']].to_dict('records')
+        # Partial selection of the top_n rows, then order just those (ties by row order)
+        idx = np.sort(np.argpartition(-yields, top_n - 1)[:top_n])
+        idx = idx[np.argsort(-yields[idx], kind='stable')]
+        
+        top_crops = crops.iloc[idx][['Crop', 'yield_gujarat', 'Category']]
+        top_crops['yield_gujarat'] = top_crops['yield_gujarat'].astype('float64').round(2)
+        
+        return top_crops.to_dict('records')
     
     def get_improvement_opportunities(self):
         """Identify crops with improvement potential"""
-        opportunities = []
+        # National average per crop in one groupby instead of a scan per crop
+        national_avg = self.main_data.merged_data['yield'].groupby(
+            self._crop_key
+        ).mean().rename('national_avg')
         
-        for crop in self.gujarat_data.get_all_crops():
-            comparison = self.compare_with_national_average(crop)
+        gujarat = self.gujarat_data.combined_gujarat[['Crop', 'yield_gujarat']].drop_duplicates('Crop')
+        gujarat = gujarat.assign(crop_key=gujarat['Crop'].str.title()).sort_values('Crop')
+        joined = gujarat.join(national_avg, on='crop_key', how='inner')
+        
+        opportunities = []
+        for crop, gujarat_yield, avg in zip(joined['Crop'], joined['yield_gujarat'], joined['national_avg']):
+            gujarat_yield = round(float(gujarat_yield), 2)  # Same precision as get_crop_stats
+            difference = round(gujarat_yield - avg, 2)
             
-            if 'error' not in comparison:
-                if comparison['gujarat_vs_national'] < 0:
-                    gap = abs(comparison['gujarat_vs_national'])
-                    opportunities.append({
-                        'crop': crop,
-                        'yield_gap': gap,
-                        'improvement_potential': round((gap / comparison['gujarat_yield']) * 100, 1),
-                        'national_average': comparison['national_average']
-                    })
+            if difference < 0:
+                gap = abs(difference)
+                opportunities.append({
+                    'crop': crop,
+                    'yield_gap': gap,
+                    'improvement_potential': round((gap / gujarat_yield) * 100, 1),
+                    'national_average': round(avg, 2)
+                })
         
         return sorted(opportunities, key=lambda x: x['improvement_potential'], reverse=True)
 
@@ -379,7 +528,7 @@ def initialize_gujarat_system():
     
     # Initialize enhanced predictor
     predictor = GujaratEnhancedPredictor(main_loader, gujarat_loader)
-    predictor.train_gujarat_specific_model()
+    predictor.load_or_train_model()
     
     # Initialize analyzer
     analyzer = GujaratAnalyzer(gujarat_loader, main_loader)
@@ -396,7 +545,11 @@ def initialize_gujarat_system():
     }
 
 
-if __name__ == "__main__":
+def main():
+    """Run the Gujarat analysis demo end to end."""
+    # Show the loading and training progress messages on the console
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     # Initialize system
     system = initialize_gujarat_system()
     
@@ -433,3 +586,7 @@ if __name__ == "__main__":
     if 'gujarat_benchmark' in wheat_prediction:
         print(f"Gujarat Benchmark: {wheat_prediction['gujarat_benchmark']:.2f} quintal/ha")
         print(f"Difference: {wheat_prediction['vs_gujarat_average']:+.2f} quintal/ha")
+
+
+if __name__ == "__main__":
+    main()
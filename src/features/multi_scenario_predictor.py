@@ -7,16 +7,29 @@ comparing outcomes across different strategies.
 
 import pandas as pd
 import numpy as np
+import os
+import json
+import hashlib
+import pickle
+from pathlib import Path
 from typing import Dict, List, Any, Union
+import joblib
+import sklearn
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import train_test_split
 import warnings
 warnings.filterwarnings('ignore')
 
+# Trained models kept across app restarts, one per data directory
+MODEL_CACHE_DIR = Path.home() / '.cache' / 'fasal-mitra'
+
 class MultiScenarioPredictor:
     """Predicts outcomes for multiple farming scenarios."""
     
+    # Random forest settings; part of the model cache key
+    MODEL_PARAMS = {'n_estimators': 100, 'max_depth': 15, 'min_samples_split': 5, 'random_state': 42}
+    
     def __init__(self, data_loader):
         self.data_loader = data_loader
         self.model = None
@@ -25,12 +38,15 @@ class MultiScenarioPredictor:
         self.is_trained = False
         
     def train_prediction_model(self):
-        """Train the ML model for yield prediction."""
+        """Train the ML model for yield prediction, reusing a cached model for unchanged data."""
+        test_score = self._load_cached_model()
+        if test_score is not None:
+            print(f"✅ Loaded prediction model from cache (Testing R²: {test_score:.3f})")
+            self.is_trained = True
+            return test_score
+            
         print("Training multi-scenario prediction model...")
         
-        if self.data_loader.merged_data is None:
-            self.data_loader.merge_datasets()
-            
         data = self.data_loader.merged_data.dropna()
         
         # Define features for prediction
@@ -53,12 +69,7 @@ class MultiScenarioPredictor:
         # Train model
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
-        self.model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=15,
-            min_samples_split=5,
-            random_state=42
-        )
+        self.model = RandomForestRegressor(**self.MODEL_PARAMS)
         
         self.model.fit(X_train, y_train)
         
@@ -70,9 +81,47 @@ class MultiScenarioPredictor:
         print(f"   Training R²: {train_score:.3f}")
         print(f"   Testing R²: {test_score:.3f}")
         
+        self._save_cached_model(test_score)
         self.is_trained = True
         return test_score
     
+    def _model_cache_paths(self):
+        """Model file and metadata for this data directory's cached model."""
+        data_dir = Path(self.data_loader.data_dir).resolve()
+        digest = hashlib.md5(str(data_dir).encode()).hexdigest()[:12]
+        model_file = MODEL_CACHE_DIR / f"scenario_model_{digest}.joblib"
+        meta = {
+            'sources': self.data_loader.source_signature(),
+            'params': self.MODEL_PARAMS,
+            'sklearn': sklearn.__version__
+        }
+        return model_file, model_file.with_suffix('.meta.json'), meta
+    
+    def _load_cached_model(self):
+        """Adopt a model trained on the same data and settings; returns its test R² or None."""
+        model_file, meta_file, meta = self._model_cache_paths()
+        try:
+            cached_meta = json.loads(meta_file.read_text())
+            if cached_meta.get('meta') != meta:
+                return None
+            test_score = float(cached_meta['test_score'])
+            self.model, self.label_encoders, self.feature_columns = joblib.load(model_file)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, KeyError, TypeError, AttributeError):
+            return None
+        return test_score
+    
+    def _save_cached_model(self, test_score):
+        """Persist the trained model for later restarts; best effort."""
+        model_file, meta_file, meta = self._model_cache_paths()
+        temp_file = model_file.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            MODEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            joblib.dump((self.model, self.label_encoders, self.feature_columns), temp_file)
+            os.replace(temp_file, model_file)  # Atomic, so readers never see a partial file
+            meta_file.write_text(json.dumps({'meta': meta, 'test_score': float(test_score)}))
+        except OSError:
+            temp_file.unlink(missing_ok=True)
+    
     def create_scenarios(self, base_params: Dict) -> List[Dict]:
         """Create multiple scenarios based on different farming strategies."""
         
@@ -133,7 +182,7 @@ class MultiScenarioPredictor:
     def _get_available_seasons(self, crop: str, state: str) -> List[str]:
         """Get available seasons for a crop-state combination."""
         data = self.data_loader.filter_data(crop=crop, state=state)
-        return data['season'].str.strip().unique().tolist()
+        return data['season'].unique().tolist()
     
     def _create_optimal_scenario(self, base_params: Dict) -> Dict:
         """Create scenario with optimal inputs based on historical best performers."""
@@ -182,18 +231,19 @@ class MultiScenarioPredictor:
         
         results = []
         
-        for scenario in scenarios:
-            # Prepare input for prediction
-            input_data = self._prepare_input_for_prediction(scenario)
-            
-            if input_data is None:
-                continue
-                
-            # Make prediction
-            predicted_yield = self.model.predict([input_data])[0]
-            
+        # Prepare inputs for prediction, skipping scenarios missing a required feature
+        prepared = [(scenario, self._prepare_input_for_prediction(scenario)) for scenario in scenarios]
+        prepared = [(scenario, input_data) for scenario, input_data in prepared if input_data is not None]
+        if not prepared:
+            return results
+        
+        # Predict every scenario in one batch, for the forest and each of its trees
+        inputs = np.array([input_data for _, input_data in prepared])
+        predicted_yields = self.model.predict(inputs)
+        prediction_stds = self._calculate_prediction_uncertainty(inputs)
+        
+        for (scenario, _), predicted_yield, prediction_std in zip(prepared, predicted_yields, prediction_stds):
             # Calculate confidence intervals using model uncertainty
-            prediction_std = self._calculate_prediction_uncertainty(input_data)
             confidence_lower = predicted_yield - 1.96 * prediction_std
             confidence_upper = predicted_yield + 1.96 * prediction_std
             
@@ -284,17 +334,14 @@ class MultiScenarioPredictor:
         
         return defaults.get(feature, 0.0)
     
-    def _calculate_prediction_uncertainty(self, input_data: List) -> float:
-        """Calculate prediction uncertainty using model variance."""
+    def _calculate_prediction_uncertainty(self, inputs: np.ndarray) -> np.ndarray:
+        """Calculate prediction uncertainty per input row using model variance."""
         
-        # Get predictions from all trees in random forest
-        tree_predictions = []
-        for tree in self.model.estimators_:
-            pred = tree.predict([input_data])[0]
-            tree_predictions.append(pred)
+        # Get predictions from all trees in random forest, one row per input
+        tree_predictions = np.column_stack([tree.predict(inputs) for tree in self.model.estimators_])
         
         # Calculate standard deviation of predictions
-        return np.std(tree_predictions)
+        return np.std(tree_predictions, axis=1)
     
     def _assess_risk_level(self, uncertainty: float, predicted_yield: float) -> str:
         """Assess risk level based on prediction uncertainty."""
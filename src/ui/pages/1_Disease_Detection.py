@@ -57,7 +57,6 @@ def load_disease_detector():
     """Load and cache the disease detector."""
     try:
         data_loader = DataLoader(str(project_root))
-        data_loader.load_datasets()
         disease_detector = CropDiseaseDetector(data_loader)
         return disease_detector
     except Exception as e:
@@ -403,10 +402,11 @@ def analyze_enhanced_crop_disease(photos_data, crop_type, location, disease_dete
         all_analyses = []
         invalid_images = []
         
-        for source, photo in photos_data:
-            image_data = photo.read()
-            
-            analysis = disease_detector.analyze_image(image_data, crop_type, location)
+        analyses = disease_detector.analyze_images(
+            [photo.read() for _, photo in photos_data], crop_type, location
+        )
+        
+        for (source, _), analysis in zip(photos_data, analyses):
             analysis['source'] = source
             
             if not analysis.get('is_valid_crop_image', True):
@@ -8,7 +8,6 @@ import sys
 from pathlib import Path
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
 
 # Add project root to path for imports
@@ -25,14 +24,11 @@ language_service = get_language_service()
 current_lang = get_current_language()
 
 # Initialize data and ML model
-@st.cache_data
+@st.cache_resource
 def load_agricultural_data():
     """Load and cache the agricultural datasets."""
     try:
-        data_loader = DataLoader(str(project_root))
-        data_loader.load_datasets()
-        data_loader.merge_datasets()
-        return data_loader
+        return DataLoader(str(project_root))
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
@@ -50,6 +46,11 @@ def initialize_predictor(_data_loader):
         st.error(f"Error initializing predictor: {e}")
         return None
 
+@st.cache_data(max_entries=100)
+def predict_single_scenario(_scenario_predictor, params):
+    """Predict one scenario, cached on its (key, value) input pairs."""
+    return _scenario_predictor.predict_scenarios([dict(params)])
+
 # Page configuration with language support
 page_title = get_text('smart_yield_prediction_title', 'en')
 st.set_page_config(
@@ -516,7 +517,7 @@ st.markdown("---")
 if st.session_state.prediction_done and 'user_inputs' in st.session_state:
     # Make real ML prediction
     with st.spinner("🤖 Making AI prediction..."):
-        results = scenario_predictor.predict_scenarios([st.session_state.user_inputs])
+        results = predict_single_scenario(scenario_predictor, tuple(st.session_state.user_inputs.items()))
     
     if not results:
         st.error("Could not generate prediction. Please try again.")
@@ -571,17 +572,18 @@ if st.session_state.prediction_done and 'user_inputs' in st.session_state:
         # Historical Context & Chart in 2-column layout
         st.markdown('<h3 style="color: var(--primary-green); margin-bottom: 1rem; margin-top: 2rem;"><i class="ri-history-line"></i> Historical Context & Comparison</h3>', unsafe_allow_html=True)
         
-        historical_data = data_loader.filter_data(crop=user_crop, state=user_state, season=user_season)
+        # Precomputed group statistics instead of filtering the records
+        historical_stats = data_loader.get_benchmark_stats(user_crop, user_state, user_season)
         
         # Initialize variables with defaults
         historical_max = 0
         historical_avg = 0
         historical_min = 0
         
-        if not historical_data.empty:
-            historical_avg = historical_data['yield'].mean()
-            historical_max = historical_data['yield'].max()
-            historical_min = historical_data['yield'].min()
+        if historical_stats is not None:
+            historical_avg = historical_stats['avg']
+            historical_max = historical_stats['mx']
+            historical_min = historical_stats['mn']
             
             hist_col1, hist_col2 = st.columns([1, 1], gap="medium")
             
@@ -601,18 +603,21 @@ if st.session_state.prediction_done and 'user_inputs' in st.session_state:
                         <li>Average: {historical_avg:.1f} quintals/ha</li>
                         <li>Best ever: {historical_max:.1f} quintals/ha</li>
                         <li>Lowest: {historical_min:.1f} quintals/ha</li>
-                        <li>Based on {len(historical_data)} historical records</li>
+                        <li>Based on {int(historical_stats['n'])} historical records</li>
                     </ul>
                 </div>
                 """, unsafe_allow_html=True)
             
             with hist_col2:
-                # Yield Distribution Chart
-                fig = px.histogram(
-                    historical_data, x='yield',
-                    title=f'Yield Distribution',
-                    labels={'yield': 'Yield (quintals/ha)', 'count': 'Records'},
-                    color_discrete_sequence=['#81C784']
+                # Yield Distribution Chart (binned once per crop-state-season in the data loader)
+                counts, edges = data_loader.get_yield_histogram(user_crop, user_state, user_season)
+                fig = go.Figure(go.Bar(
+                    x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                    marker_color='#81C784'
+                ))
+                fig.update_layout(
+                    title='Yield Distribution',
+                    xaxis_title='Yield (quintals/ha)', yaxis_title='Records'
                 )
                 
                 # Add prediction line
@@ -6,7 +6,6 @@ Compare multiple "what-if" farming scenarios
 import streamlit as st
 import sys
 from pathlib import Path
-import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
@@ -26,14 +25,11 @@ language_service = get_language_service()
 current_lang = get_current_language()
 
 # Initialize data and ML model
-@st.cache_data
+@st.cache_resource
 def load_agricultural_data():
     """Load and cache the agricultural datasets."""
     try:
-        data_loader = DataLoader(str(project_root))
-        data_loader.load_datasets()
-        data_loader.merge_datasets()
-        return data_loader
+        return DataLoader(str(project_root))
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
@@ -51,6 +47,12 @@ def initialize_predictor(_data_loader):
         st.error(f"Error initializing predictor: {e}")
         return None
 
+@st.cache_data(max_entries=100)
+def run_scenario_analysis(_scenario_predictor, params):
+    """Create, predict and compare scenarios, cached on the (key, value) input pairs."""
+    scenario_results = _scenario_predictor.predict_scenarios(_scenario_predictor.create_scenarios(dict(params)))
+    return scenario_results, _scenario_predictor.compare_scenarios(scenario_results)
+
 # Page configuration with language support
 page_title = get_text('multi_scenario_predictor_title', 'en')
 st.set_page_config(
@@ -448,10 +450,9 @@ st.markdown("---")
 if st.session_state.scenarios_generated and 'base_params' in st.session_state:
     # Generate scenarios and predictions
     with st.spinner("🤖 Generating and analyzing multiple scenarios..."):
+        # Reruns with unchanged inputs reuse the cached results
         base_params = st.session_state.base_params
-        scenarios = scenario_predictor.create_scenarios(base_params)
-        scenario_results = scenario_predictor.predict_scenarios(scenarios)
-        comparison = scenario_predictor.compare_scenarios(scenario_results)
+        scenario_results, comparison = run_scenario_analysis(scenario_predictor, tuple(base_params.items()))
     
     if not scenario_results:
         st.error("Could not generate scenario predictions. Please try again.")
@@ -461,7 +462,8 @@ if st.session_state.scenarios_generated and 'base_params' in st.session_state:
         
         # Scenario Comparison Table
         st.markdown("**📊 Scenario Comparison Table**")
-        scenario_df = pd.DataFrame([
+        # Already-formatted strings, so hand the rows straight to Streamlit
+        scenario_rows = [
             {
                 'Scenario': result['scenario_name'],
                 'Type': result.get('scenario_type', 'N/A').replace('_', ' ').title(),
@@ -471,16 +473,24 @@ if st.session_state.scenarios_generated and 'base_params' in st.session_state:
                 'Confidence Range': result['yield_range']
             }
             for result in scenario_results
-        ])
-        st.dataframe(scenario_df, use_container_width=True, hide_index=True)
+        ]
+        st.dataframe(scenario_rows, use_container_width=True, hide_index=True)
         
         # Yield vs Profit Chart
         st.markdown('<h3 style="color: var(--primary-green); margin-top: 2rem; margin-bottom: 1rem;"><i class="ri-line-chart-line"></i> Yield vs Profit Analysis</h3>', unsafe_allow_html=True)
         
-        yields = [r['predicted_yield'] for r in scenario_results]
-        profits = [r['estimated_profit']['profit'] for r in scenario_results]
-        names = [r['scenario_name'] for r in scenario_results]
-        colors = [{'low': '#2E7D32', 'medium': '#F57C00', 'high': '#D32F2F'}[r['risk_level']] for r in scenario_results]
+        # One pass over the results for every chart column
+        risk_colors = {'low': '#2E7D32', 'medium': '#F57C00', 'high': '#D32F2F'}
+        risk_mapping = {'low': 1, 'medium': 2, 'high': 3}
+        names, yields, profits, risk_scores, colors = zip(*(
+            (r['scenario_name'], r['predicted_yield'], r['estimated_profit']['profit'],
+             risk_mapping[r['risk_level']], risk_colors[r['risk_level']])
+            for r in scenario_results
+        ))
+        # Numeric columns as arrays, which Plotly takes without converting
+        names, colors = list(names), list(colors)
+        yields, profits = np.array(yields), np.array(profits)
+        risk_scores = np.array(risk_scores, dtype=np.int8)
         
         fig = make_subplots(specs=[[{"secondary_y": True}]])
         
@@ -510,11 +520,7 @@ if st.session_state.scenarios_generated and 'base_params' in st.session_state:
         # Risk vs Return Scatter
         st.markdown('<h3 style="color: var(--primary-green); margin-top: 2rem; margin-bottom: 1rem;"><i class="ri-bubble-chart-line"></i> Risk vs Return Analysis</h3>', unsafe_allow_html=True)
         
-        risk_mapping = {'low': 1, 'medium': 2, 'high': 3}
-        risk_scores = [risk_mapping[r['risk_level']] for r in scenario_results]
-        
-        min_profit = min(profits)
-        size_values = [abs(p - min_profit) + 1000 for p in profits]
+        size_values = np.abs(profits - profits.min()) + 1000
         
         fig = px.scatter(
             x=risk_scores, y=yields, text=names, size=size_values,
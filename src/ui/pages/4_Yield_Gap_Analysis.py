@@ -23,14 +23,12 @@ from src.utils.language_service import get_language_service, get_text, get_curre
 language_service = get_language_service()
 current_lang = get_current_language()
 
-@st.cache_data
+@st.cache_resource
 def load_agricultural_data():
     """Load and cache agricultural data"""
     # Get project root (4 levels up from this file)
     project_root = Path(__file__).parent.parent.parent.parent
-    data_loader = DataLoader(data_dir="dummy")  # Use non-".." to trigger else branch
-    data_loader.data_dir = project_root  # Directly set the correct path
-    return data_loader
+    return DataLoader(str(project_root))
 
 @st.cache_resource
 def initialize_analyzer(_data_loader):
@@ -342,10 +340,6 @@ try:
     data_loader = load_agricultural_data()
     analyzer = initialize_analyzer(data_loader)
     
-    # Load datasets if not already loaded
-    if data_loader.merged_data is None:
-        data_loader.merge_datasets()
-    
     available_crops = data_loader.get_crop_list()
     available_states = data_loader.get_state_list()
     available_seasons = data_loader.get_season_list()
@@ -514,25 +508,26 @@ if st.session_state.analysis_done:
             # Yield Distribution Chart
             st.markdown('<h3 style="color: var(--primary-green); margin-bottom: 1rem; margin-top: 1.5rem;"><i class="ri-bar-chart-box-line"></i> Yield Distribution</h3>', unsafe_allow_html=True)
             
-            # Get visualization data
-            viz_data = analyzer.generate_visualization_data(
-                user_yield=st.session_state.current_yield,
-                crop=st.session_state.crop,
-                state=st.session_state.state,
-                season=selected_season
+            # Histogram binned once per crop-state-season in the data loader,
+            # so only the 30 bar heights are sent to the browser
+            histogram = data_loader.get_yield_histogram(
+                st.session_state.crop, st.session_state.state, selected_season
             )
             
             # Create histogram with benchmark lines
             fig = go.Figure()
             
             # Histogram of all yields
-            fig.add_trace(go.Histogram(
-                x=viz_data['yield_distribution'],
-                name='Yield Distribution',
-                marker_color='#81C784',
-                opacity=0.7,
-                nbinsx=30
-            ))
+            if histogram is not None:
+                counts, edges = histogram
+                fig.add_trace(go.Bar(
+                    x=(edges[:-1] + edges[1:]) / 2,
+                    y=counts,
+                    width=np.diff(edges),
+                    name='Yield Distribution',
+                    marker_color='#81C784',
+                    opacity=0.7
+                ))
             
             # Add vertical lines for benchmarks
             fig.add_vline(x=st.session_state.current_yield, line_dash="dash", 
@@ -671,7 +666,7 @@ if st.session_state.analysis_done:
                     <h4 style="color: var(--primary-green); margin-top: 0;">📈 Key Insights</h4>
                 """, unsafe_allow_html=True)
                 
-                for rec in recommendations[:3]:
+                for _, rec in recommendations[:3]:
                     st.markdown(f"- {rec}")
                 
                 st.markdown("</div>", unsafe_allow_html=True)
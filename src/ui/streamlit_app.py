@@ -10,18 +10,9 @@ A comprehensive web application for agricultural decision support with 3 advance
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import sys
-import os
 from pathlib import Path
-import cv2
 from datetime import datetime, timedelta
-import json
-from PIL import Image, ImageDraw, ImageFont
-import requests
-import hashlib
 from dotenv import load_dotenv
 
 # Load environment variables early
@@ -33,26 +24,47 @@ project_root = Path(__file__).parent.parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-# Import our custom modules
+# Import our custom modules (plotting libraries and the feature modules are
+# imported where they are first used, so pages that don't need them skip the cost)
 from src.core.data_loader import DataLoader
-from src.features.yield_gap_analyzer import YieldGapAnalyzer
-from src.features.multi_scenario_predictor import MultiScenarioPredictor
-from features.crop_disease_detector import CropDiseaseDetector
 from src.utils.translator import LanguageTranslator, WEATHER_TRANSLATIONS
 from src.utils.farmer_helper_bot import FarmerHelperBot, show_help_icon_with_chatbot, show_general_chatbot
 from src.features.weather_service import WeatherService
 from src.utils.location_service import LocationService, EXAMPLE_LOCATIONS
 
+# Key Factors Analysis: (low, high) bounds and the (Streamlit call, message) shown
+# below, within and above them
+KEY_FACTOR_CHECKS = {
+    'fertilizer': ((20000, 40000), (
+        ('warning', "💡 **Fertilizer**: You're using {value:,} kg/ha. Consider increasing for better yield"),
+        ('success', "✅ **Fertilizer**: Your {value:,} kg/ha is in reasonable range"),
+        ('error', "⚠️ **Fertilizer**: You're using {value:,} kg/ha. This might be excessive"),
+    )),
+    'pH': ((6.0, 8.0), (
+        ('warning', "🔬 **Soil pH**: {value:.1f} is acidic. Consider liming"),
+        ('success', "✅ **Soil pH**: {value:.1f} is in good range"),
+        ('warning', "🔬 **Soil pH**: {value:.1f} is alkaline. Consider organic matter"),
+    )),
+    'rainfall': ((500, 2000), (
+        ('warning', "🌧️ **Rainfall**: {value}mm might be insufficient for {crop}"),
+        ('success', "✅ **Rainfall**: {value}mm is suitable for {crop}"),
+        ('warning', "🌧️ **Rainfall**: {value}mm might be excessive for {crop}"),
+    )),
+}
+
+def key_factor_level(values, bounds):
+    """0 below, 1 within and 2 above the (low, high) bounds; works on scalars and arrays."""
+    low, high = bounds
+    return np.add(np.greater_equal(values, low), np.greater(values, high), dtype=np.intp)
+
 # Initialize data and features
-@st.cache_data
+@st.cache_resource
 def load_agricultural_data():
     """Load and cache the agricultural datasets."""
     try:
         # Use project root for data loading
         project_root = Path(__file__).parent.parent.parent
-        data_loader = DataLoader(str(project_root))
-        data_loader.load_datasets()
-        return data_loader
+        return DataLoader(str(project_root))
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
@@ -73,6 +85,10 @@ def initialize_features(_data_loader):
         return None, None, None, None
         
     try:
+        from src.features.yield_gap_analyzer import YieldGapAnalyzer
+        from src.features.multi_scenario_predictor import MultiScenarioPredictor
+        from features.crop_disease_detector import CropDiseaseDetector
+        
         gap_analyzer = YieldGapAnalyzer(_data_loader)
         scenario_predictor = MultiScenarioPredictor(_data_loader)
         disease_detector = CropDiseaseDetector(_data_loader)
@@ -82,6 +98,26 @@ def initialize_features(_data_loader):
         st.error(f"Error initializing features: {e}")
         return None, None, None, None
 
+@st.cache_data(max_entries=100)
+def run_scenario_analysis(_scenario_predictor, params):
+    """Create, predict and compare scenarios, cached on the (key, value) input pairs."""
+    scenario_results = _scenario_predictor.predict_scenarios(_scenario_predictor.create_scenarios(dict(params)))
+    return scenario_results, _scenario_predictor.compare_scenarios(scenario_results)
+
+@st.cache_data(max_entries=100)
+def predict_single_scenario(_scenario_predictor, params):
+    """Predict one scenario, cached on its (key, value) input pairs."""
+    return _scenario_predictor.predict_scenarios([dict(params)])
+
+@st.cache_data(max_entries=100)
+def benchmark_figure(categories, yields, colors):
+    """Build the horizontal benchmarking bar chart, cached per set of labels and values."""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(go.Bar(x=yields, y=categories, orientation='h', marker_color=colors))
+    fig.update_layout(title="Yield Benchmarking Analysis", showlegend=False, height=400)
+    return fig
+
 @st.cache_data(ttl=300)  # Cache for 5 minutes
 def cached_disease_analysis(image_hash, crop_type, location):
     """Cache disease analysis results to avoid redundant processing."""
@@ -480,15 +516,11 @@ def analyze_yield_gap(gap_analyzer, crop, state, season, user_yield, translator,
         'Color': ['red', 'orange', 'blue', 'lightgreen', 'green', 'darkgreen']
     }
     
-    fig = px.bar(
-        x=benchmark_data['Yield'],
-        y=benchmark_data['Category'],
-        orientation='h',
-        color=benchmark_data['Color'],
-        color_discrete_map={color: color for color in benchmark_data['Color']},
-        title="Yield Benchmarking Analysis"
+    fig = benchmark_figure(
+        tuple(benchmark_data['Category']),
+        tuple(benchmark_data[translator.get_text('yield_label', selected_lang)]),
+        tuple(benchmark_data['Color'])
     )
-    fig.update_layout(showlegend=False, height=400)
     st.plotly_chart(fig, width="stretch")
     
     # Improvement Potential
@@ -517,18 +549,10 @@ def analyze_yield_gap(gap_analyzer, crop, state, season, user_yield, translator,
     # Recommendations
     st.subheader("💡 Personalized Recommendations")
     
-    recommendations = gap_analysis['recommendations']
-    for rec in recommendations:
-        if rec.startswith('🏆'):
-            st.success(rec)
-        elif rec.startswith('👍'):
-            st.info(rec)
-        elif rec.startswith('📈'):
-            st.warning(rec) 
-        elif rec.startswith('🎯'):
-            st.error(rec)
-        else:
-            st.write(rec)
+    # Indexed by recommendation severity: the four performance levels, then advice
+    render = (st.success, st.info, st.warning, st.error, st.write)
+    for severity, rec in gap_analysis['recommendations']:
+        render[severity](rec)
 
 def show_multi_scenario_predictor(data_loader, scenario_predictor, translator, selected_lang):
     """Display multi-scenario prediction interface."""
@@ -543,55 +567,63 @@ def show_multi_scenario_predictor(data_loader, scenario_predictor, translator, s
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            crop = st.selectbox("🌱 Crop", data_loader.get_crop_list())
-            state = st.selectbox("📍 State", data_loader.get_state_list())
+            crop = st.selectbox("🌱 Crop", data_loader.get_crop_list(), key="crop_ms")
+            state = st.selectbox("📍 State", data_loader.get_state_list(), key="state_ms")
             
         with col2:
-            season = st.selectbox("🗓️ Season", data_loader.get_season_list())
-            area = st.number_input("📏 Area (hectares)", min_value=0.1, value=1.0, step=0.1)
+            season = st.selectbox("🗓️ Season", data_loader.get_season_list(), key="season_ms")
+            area = st.number_input("📏 Area (hectares)", min_value=0.1, value=1.0, step=0.1, key="area_ms")
             
         with col3:
-            fertilizer = st.number_input("🧪 Fertilizer (kg/ha)", min_value=0, value=25000, step=1000)
-            pesticide = st.number_input("🦗 Pesticide (kg/ha)", min_value=0, value=500, step=50)
+            fertilizer = st.number_input("🧪 Fertilizer (kg/ha)", min_value=0, value=25000, step=1000, key="fertilizer_ms")
+            pesticide = st.number_input("🦗 Pesticide (kg/ha)", min_value=0, value=500, step=50, key="pesticide_ms")
         
         st.subheader("🌤️ Environmental Conditions")
         
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            avg_temp = st.number_input("🌡️ Avg Temperature (°C)", min_value=10.0, max_value=45.0, value=25.0)
+            avg_temp = st.number_input("🌡️ Avg Temperature (°C)", min_value=10.0, max_value=45.0, value=25.0, key="temp_ms")
             show_help_icon_with_chatbot("Temperature", "Average temperature for crop growth")
             
-            rainfall = st.number_input("🌧️ Total Rainfall (mm)", min_value=100, max_value=3000, value=1000)
+            rainfall = st.number_input("🌧️ Total Rainfall (mm)", min_value=100, max_value=3000, value=1000, key="rain_ms")
             show_help_icon_with_chatbot("Rainfall", "Total rainfall during crop season")
             
         with col2:
-            humidity = st.number_input("💧 Avg Humidity (%)", min_value=30, max_value=100, value=70)
+            humidity = st.number_input("💧 Avg Humidity (%)", min_value=30, max_value=100, value=70, key="humid_ms")
             show_help_icon_with_chatbot("Humidity", "Average humidity in the air")
             
-            pH = st.number_input("🔬 Soil pH", min_value=4.0, max_value=9.0, value=6.5, step=0.1)
+            pH = st.number_input("🔬 Soil pH", min_value=4.0, max_value=9.0, value=6.5, step=0.1, key="ph_ms")
             show_help_icon_with_chatbot("pH", "Soil acidity or alkalinity level")
             
         with col3:
-            N = st.number_input("🧪 Nitrogen (N)", min_value=20, max_value=200, value=75)
+            N = st.number_input("🧪 Nitrogen (N)", min_value=20, max_value=200, value=75, key="n_ms")
             show_help_icon_with_chatbot("N", "Nitrogen nutrient in soil")
             
-            P = st.number_input("🧪 Phosphorus (P)", min_value=10, max_value=80, value=35)
+            P = st.number_input("🧪 Phosphorus (P)", min_value=10, max_value=80, value=35, key="p_ms")
             show_help_icon_with_chatbot("P", "Phosphorus nutrient in soil")
             
-            K = st.number_input("🧪 Potassium (K)", min_value=10, max_value=60, value=30)
+            K = st.number_input("🧪 Potassium (K)", min_value=10, max_value=60, value=30, key="k_ms")
             show_help_icon_with_chatbot("K", "Potassium nutrient in soil")
         
         submitted = st.form_submit_button("🔮 Generate Scenarios", type="primary")
     
-    if submitted and scenario_predictor:
-        predict_multiple_scenarios(
-            scenario_predictor, crop, state, season, area, fertilizer, 
-            pesticide, avg_temp, rainfall, humidity, pH, N, P, K
+    # Keep the submitted inputs so reruns from other widgets redraw the
+    # (cached) results instead of clearing them
+    if submitted:
+        st.session_state.scenario_inputs_ms = (
+            crop, state, season, area, fertilizer, pesticide,
+            avg_temp, rainfall, humidity, pH, N, P, K
         )
+    
+    if scenario_predictor and 'scenario_inputs_ms' in st.session_state:
+        predict_multiple_scenarios(scenario_predictor, *st.session_state.scenario_inputs_ms)
 
 def predict_multiple_scenarios(scenario_predictor, crop, state, season, area, fertilizer, pesticide, avg_temp, rainfall, humidity, pH, N, P, K):
     """Generate and display multiple scenario predictions."""
+    import plotly.graph_objects as go
+    import plotly.express as px
+    from plotly.subplots import make_subplots
     
     # Prepare base parameters
     base_params = {
@@ -602,14 +634,8 @@ def predict_multiple_scenarios(scenario_predictor, crop, state, season, area, fe
     }
     
     with st.spinner("Generating multiple scenarios..."):
-        # Create scenarios
-        scenarios = scenario_predictor.create_scenarios(base_params)
-        
-        # Predict outcomes
-        scenario_results = scenario_predictor.predict_scenarios(scenarios)
-        
-        # Generate comparison
-        comparison = scenario_predictor.compare_scenarios(scenario_results)
+        # Create, predict and compare - re-submitting the same inputs reuses the cached results
+        scenario_results, comparison = run_scenario_analysis(scenario_predictor, tuple(base_params.items()))
     
     if not scenario_results:
         st.error("Could not generate scenario predictions. Please check your inputs.")
@@ -618,7 +644,8 @@ def predict_multiple_scenarios(scenario_predictor, crop, state, season, area, fe
     # Scenario Comparison Table
     st.subheader("📊 Scenario Comparison")
     
-    scenario_df = pd.DataFrame([
+    # Already-formatted strings, so hand the rows straight to Streamlit
+    scenario_rows = [
         {
             'Scenario': result['scenario_name'],
             'Predicted Yield': f"{result['predicted_yield']:.1f} q/ha",
@@ -627,17 +654,25 @@ def predict_multiple_scenarios(scenario_predictor, crop, state, season, area, fe
             'Confidence Range': result['yield_range']
         }
         for result in scenario_results
-    ])
+    ]
     
-    st.dataframe(scenario_df, width="stretch")
+    st.dataframe(scenario_rows, width="stretch")
     
     # Scenario Comparison Chart
     st.subheader("📈 Yield vs Profit Analysis")
     
-    yields = [r['predicted_yield'] for r in scenario_results]
-    profits = [r['estimated_profit']['profit'] for r in scenario_results]
-    names = [r['scenario_name'] for r in scenario_results]
-    colors = [{'low': 'green', 'medium': 'orange', 'high': 'red'}[r['risk_level']] for r in scenario_results]
+    # One pass over the results for every chart column
+    risk_colors = {'low': 'green', 'medium': 'orange', 'high': 'red'}
+    risk_mapping = {'low': 1, 'medium': 2, 'high': 3}
+    names, yields, profits, risk_scores, colors = zip(*(
+        (r['scenario_name'], r['predicted_yield'], r['estimated_profit']['profit'],
+         risk_mapping[r['risk_level']], risk_colors[r['risk_level']])
+        for r in scenario_results
+    ))
+    # Numeric columns as arrays, which Plotly takes without converting
+    names, colors = list(names), list(colors)
+    yields, profits = np.array(yields), np.array(profits)
+    risk_scores = np.array(risk_scores, dtype=np.int8)
     
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     
@@ -662,13 +697,9 @@ def predict_multiple_scenarios(scenario_predictor, crop, state, season, area, fe
     # Risk vs Return Scatter
     st.subheader("⚖️ Risk vs Return Analysis")
     
-    risk_mapping = {'low': 1, 'medium': 2, 'high': 3}
-    risk_scores = [risk_mapping[r['risk_level']] for r in scenario_results]
-    
     # Ensure positive size values for scatter plot
-    min_profit = min(profits)
     # Convert to absolute values and ensure all are positive
-    size_values = [abs(p - min_profit) + 1000 for p in profits]
+    size_values = np.abs(profits - profits.min()) + 1000
     
     fig = px.scatter(
         x=risk_scores, y=yields, text=names, size=size_values,
@@ -751,6 +782,7 @@ def show_smart_prediction(data_loader, scenario_predictor, translator, selected_
 
 def make_smart_prediction(scenario_predictor, crop, state, season, fertilizer, pH, rainfall, data_loader):
     """Make prediction with detailed explanations."""
+    import plotly.graph_objects as go
     
     # Prepare input
     user_inputs = {
@@ -762,7 +794,7 @@ def make_smart_prediction(scenario_predictor, crop, state, season, fertilizer, p
     }
     
     with st.spinner("Making AI prediction..."):
-        results = scenario_predictor.predict_scenarios([user_inputs])
+        results = predict_single_scenario(scenario_predictor, tuple(user_inputs.items()))
     
     if not results:
         st.error("Could not generate prediction.")
@@ -800,11 +832,12 @@ def make_smart_prediction(scenario_predictor, crop, state, season, fertilizer, p
     # Historical Context
     st.subheader("📈 Historical Context")
     
-    historical_data = data_loader.filter_data(crop=crop, state=state, season=season)
+    # Precomputed group statistics instead of filtering the records
+    historical_stats = data_loader.get_benchmark_stats(crop, state, season)
     
-    if not historical_data.empty:
-        historical_avg = historical_data['yield'].mean()
-        historical_max = historical_data['yield'].max()
+    if historical_stats is not None:
+        historical_avg = historical_stats['avg']
+        historical_max = historical_stats['mx']
         
         col1, col2 = st.columns(2)
         
@@ -813,7 +846,7 @@ def make_smart_prediction(scenario_predictor, crop, state, season, fertilizer, p
             **Regional Historical Performance**  
             Average: {historical_avg:.1f} quintal/ha  
             Best ever: {historical_max:.1f} quintal/ha  
-            Records: {len(historical_data)} data points
+            Records: {int(historical_stats['n'])} data points
             """)
         
         with col2:
@@ -822,14 +855,16 @@ def make_smart_prediction(scenario_predictor, crop, state, season, fertilizer, p
             else:
                 st.warning(f"⚠️ Your prediction is {historical_avg - prediction['predicted_yield']:.1f} quintal/ha **below** regional average")
     
-    # Yield Distribution Chart
-    if not historical_data.empty:
+    # Yield Distribution Chart (binned once per crop-state-season in the data loader)
+    histogram = data_loader.get_yield_histogram(crop, state, season)
+    if histogram is not None:
         st.subheader("📊 How You Compare")
         
-        fig = px.histogram(
-            historical_data, x='yield', 
+        counts, edges = histogram
+        fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges)))
+        fig.update_layout(
             title=f'Yield Distribution: {crop} in {state}',
-            labels={'yield': 'Yield (quintal/ha)', 'count': 'Number of Records'}
+            xaxis_title='Yield (quintal/ha)', yaxis_title='Number of Records'
         )
         
         # Add your prediction line
@@ -857,26 +892,10 @@ def make_smart_prediction(scenario_predictor, crop, state, season, fertilizer, p
         
         st.write("**Your Input Analysis:**")
         
-        if fertilizer < 20000:
-            st.warning(f"💡 **Fertilizer**: You're using {fertilizer:,} kg/ha. Consider increasing for better yield")
-        elif fertilizer > 40000:
-            st.error(f"⚠️ **Fertilizer**: You're using {fertilizer:,} kg/ha. This might be excessive")
-        else:
-            st.success(f"✅ **Fertilizer**: Your {fertilizer:,} kg/ha is in reasonable range")
-        
-        if pH < 6.0:
-            st.warning(f"🔬 **Soil pH**: {pH:.1f} is acidic. Consider liming")
-        elif pH > 8.0:
-            st.warning(f"🔬 **Soil pH**: {pH:.1f} is alkaline. Consider organic matter") 
-        else:
-            st.success(f"✅ **Soil pH**: {pH:.1f} is in good range")
-        
-        if rainfall < 500:
-            st.warning(f"🌧️ **Rainfall**: {rainfall}mm might be insufficient for {crop}")
-        elif rainfall > 2000:
-            st.warning(f"🌧️ **Rainfall**: {rainfall}mm might be excessive for {crop}")
-        else:
-            st.success(f"✅ **Rainfall**: {rainfall}mm is suitable for {crop}")
+        for factor, value in (('fertilizer', fertilizer), ('pH', pH), ('rainfall', rainfall)):
+            bounds, messages = KEY_FACTOR_CHECKS[factor]
+            level, message = messages[key_factor_level(value, bounds)]
+            getattr(st, level)(message.format(value=value, crop=crop))
 
 def show_disease_detection(data_loader, disease_detector, translator, selected_lang):
     """Enhanced AI-powered crop disease detection interface with multiple features."""
@@ -1112,12 +1131,12 @@ def analyze_enhanced_crop_disease(photos_data, crop_type, location, disease_dete
         all_analyses = []
         invalid_images = []
         
-        # Process images in parallel-like manner (streamlined)
-        for source, photo in photos_data:
-            image_data = photo.read()
-            
-            # Fast analysis with minimal overhead
-            analysis = disease_detector.analyze_image(image_data, crop_type, location)
+        # Analyze the whole batch in one call so shared work is done once
+        analyses = disease_detector.analyze_images(
+            [photo.read() for _, photo in photos_data], crop_type, location
+        )
+        
+        for (source, _), analysis in zip(photos_data, analyses):
             analysis['source'] = source
             
             # Quick validation check
@@ -1278,6 +1297,8 @@ def show_image_validation_summary(analysis):
 
 def show_symptom_highlighting(image, analysis):
     """Display image with highlighted symptoms."""
+    from PIL import Image, ImageDraw
+    
     st.subheader("🎯 Smart Symptom Highlighting")
     
     col1, col2 = st.columns([1, 1])
@@ -1458,6 +1479,8 @@ def show_disease_progression_timeline():
         
         # Progression chart
         if len(timeline_data) > 1:
+            import plotly.express as px
+            
             fig = px.line(df_timeline, x='Analysis #', y='Diseases Found', 
                          title='Disease Detection Over Time',
                          markers=True)
@@ -1598,8 +1621,8 @@ def analyze_crop_disease(uploaded_file, crop_type, location, disease_detector):
         # Convert uploaded file to image data
         image_data = uploaded_file.read()
         
-        # Run AI analysis
-        analysis_report = disease_detector.analyze_image(image_data, crop_type, location)
+        # Run AI analysis with treatment plans and consultation in one pass
+        analysis_report = disease_detector.full_report(image_data, crop_type, location)
     
     # Display results
     st.success("✅ Analysis Complete!")
@@ -1637,10 +1660,8 @@ def analyze_crop_disease(uploaded_file, crop_type, location, disease_detector):
                 col1, col2 = st.columns([2, 1])
                 
                 with col1:
-                    # Get detailed treatment plan
-                    treatment_plan = disease_detector.get_treatment_plan(
-                        disease['disease_id'], disease['severity'], crop_type
-                    )
+                    # Detailed treatment plan
+                    treatment_plan = analysis_report['treatment_plans'][disease['disease_id']]
                     
                     st.write(f"**Confidence:** {disease['confidence']:.0%}")
                     st.write(f"**Severity:** {disease['severity'].title()}")
@@ -1684,7 +1705,7 @@ def analyze_crop_disease(uploaded_file, crop_type, location, disease_detector):
     # Prevention Strategies
     st.subheader("🛡️ Prevention Strategies")
     
-    prevention = disease_detector.get_prevention_strategies(crop_type, location)
+    prevention = analysis_report['prevention']
     
     with st.expander("📅 Seasonal Management Calendar", expanded=False):
         for stage, activities in prevention['seasonal_calendar'].items():
@@ -1700,7 +1721,7 @@ def analyze_crop_disease(uploaded_file, crop_type, location, disease_detector):
     # Expert Consultation
     st.subheader("👨‍🌾 Expert Consultation")
     
-    consultation = disease_detector.generate_expert_consultation_request(analysis_report)
+    consultation = analysis_report['expert_consultation']
     
     if consultation['needed']:
         st.warning("🔔 **Expert consultation recommended for this case**")
@@ -1824,6 +1845,10 @@ def show_disease_education(disease_detector):
                     st.write(f"• {prevention}")
             
             st.write("---")
+        
+        st.write("*Typical Treatment Costs:*")
+        for severity, costs in disease_detector.get_treatment_cost_overview().items():
+            st.write(f"• {severity.title()}: ₹{costs['min']:,} - ₹{costs['max']:,} (avg ₹{costs['average']:,})")
     
     with st.expander("💡 Pro Tips for Disease Management"):
         tips = [
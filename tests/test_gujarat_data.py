@@ -10,6 +10,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pandas as pd
+import numpy as np
 
 print("="*70)
 print("🌾 GUJARAT AGRICULTURAL DATA ANALYSIS 🌾")
@@ -23,11 +24,11 @@ oilseeds = pd.read_csv('data/gujarat/oilseeds1.csv')
 foodgrains.columns = foodgrains.columns.str.strip()
 oilseeds.columns = oilseeds.columns.str.strip()
 
-foodgrains = foodgrains[~foodgrains['Crop'].str.contains('Total', na=False)]
+foodgrains = foodgrains[~foodgrains['Crop'].str.contains('Total', na=False, regex=False)]
 foodgrains = foodgrains.dropna(subset=['Sr. No.'])
 
 oilseeds.rename(columns={'Crops': 'Crop'}, inplace=True)
-oilseeds = oilseeds[~oilseeds['Crop'].str.contains('Total', na=False)]
+oilseeds = oilseeds[~oilseeds['Crop'].str.contains('Total', na=False, regex=False)]
 oilseeds = oilseeds.dropna(subset=['Sr. No.'])
 
 # Standardize column names
@@ -38,14 +39,8 @@ oilseeds.rename(columns={'Yield': 'Yield'}, inplace=True)
 oilseeds['Category'] = 'Oilseeds'
 
 # Categorize foodgrains
-def categorize(crop):
-    cereals = ['Rice', 'Wheat', 'Jowar', 'Bajra', 'Maize', 'Ragi', 'Small Millets']
-    if crop in cereals:
-        return 'Cereals'
-    else:
-        return 'Pulses'
-
-foodgrains['Category'] = foodgrains['Crop'].apply(categorize)
+cereals = {'Rice', 'Wheat', 'Jowar', 'Bajra', 'Maize', 'Ragi', 'Small Millets'}
+foodgrains['Category'] = np.where(foodgrains['Crop'].isin(cereals), 'Cereals', 'Pulses')
 
 combined = pd.concat([foodgrains, oilseeds], ignore_index=True)
 
@@ -57,36 +52,37 @@ print(f"   Categories: {combined['Category'].nunique()}")
 print(f"\n🏆 TOP 10 CROPS BY YIELD:")
 print("="*70)
 top_10 = combined.nlargest(10, 'Yield')
-for idx, (i, row) in enumerate(top_10.iterrows(), 1):
-    print(f"{idx:2d}. {row['Crop']:25s} {row['Yield']:8.2f} q/ha  [{row['Category']}]")
+crops, yields, categories = (top_10[col].to_numpy() for col in ('Crop', 'Yield', 'Category'))
+for idx, (crop, crop_yield, category) in enumerate(zip(crops, yields, categories), 1):
+    print(f"{idx:2d}. {crop:25s} {crop_yield:8.2f} q/ha  [{category}]")
 
 # Category summary
 print(f"\n📈 CATEGORY-WISE PERFORMANCE:")
 print("="*70)
-category_summary = combined.groupby('Category').agg({
-    'Area': 'sum',
-    'Production': 'sum',
-    'Yield': 'mean'
-}).round(2)
-
-category_summary['Crops'] = combined.groupby('Category').size()
+category_summary = combined.groupby('Category').agg(
+    Area=('Area', 'sum'),
+    Production=('Production', 'sum'),
+    Yield=('Yield', 'mean'),
+    Crops=('Crop', 'size')
+).round(2)
 
 print(category_summary.to_string())
 
 # Bottom performers - improvement opportunities
 print(f"\n⚠️  CROPS NEEDING IMPROVEMENT (Yield < 1000 q/ha):")
 print("="*70)
-low_yield = combined[combined['Yield'] < 1000].sort_values('Yield')
-for idx, (i, row) in enumerate(low_yield.iterrows(), 1):
-    improvement_potential = 1500 - row['Yield']  # Target 1500 q/ha
-    print(f"{idx}. {row['Crop']:25s} {row['Yield']:8.2f} q/ha  "
-          f"[Gap: +{improvement_potential:.2f} to reach target]")
+low_yield = combined.query('Yield < 1000').sort_values('Yield')
+crops, yields = low_yield['Crop'].to_numpy(), low_yield['Yield'].to_numpy()
+improvement_potential = 1500 - yields  # Target 1500 q/ha
+for idx, (crop, crop_yield, gap) in enumerate(zip(crops, yields, improvement_potential), 1):
+    print(f"{idx}. {crop:25s} {crop_yield:8.2f} q/ha  "
+          f"[Gap: +{gap:.2f} to reach target]")
 
 # Compare with main dataset
 print(f"\n🔍 CHECKING INTEGRATION WITH MAIN DATASET:")
 print("="*70)
 try:
-    main_data = pd.read_csv('data/raw/crop_yield.csv')
+    main_data = pd.read_csv('data/raw/crop_yield.csv', engine='pyarrow')
     gujarat_records = main_data[main_data['state'].str.strip() == 'Gujarat']
     
     print(f"   Main dataset total records: {len(main_data):,}")
@@ -94,32 +90,26 @@ try:
     print(f"   Gujarat-specific new records: {len(combined)}")
     print(f"   Years covered in main data: {gujarat_records['year'].min()}-{gujarat_records['year'].max()}")
     
-    # Check crop overlap
-    main_crops = set(gujarat_records['crop'].str.strip().str.title().unique())
-    new_crops = set(combined['Crop'].str.strip().str.title())
+    # Normalise crop names once per dataset, then line the two up with one join
+    hist_avg = gujarat_records['yield'].groupby(gujarat_records['crop'].str.strip().str.title()).mean()
+    current = combined['Yield'].groupby(combined['Crop'].str.strip().str.title()).first()
     
-    overlap = main_crops.intersection(new_crops)
-    print(f"\n   Crops in both datasets: {len(overlap)}")
-    print(f"   Examples: {', '.join(list(overlap)[:5])}")
+    comparison = hist_avg.to_frame('historical').join(current.rename('current'), how='inner')
+    comparison['diff'] = comparison['current'] - comparison['historical']
+    comparison['percent'] = comparison['diff'] / comparison['historical'] * 100
+    
+    # Check crop overlap
+    examples = comparison.head(5)
+    print(f"\n   Crops in both datasets: {len(comparison)}")
+    print(f"   Examples: {', '.join(examples.index)}")
     
     # Compare yields for common crops
     print(f"\n📊 YIELD COMPARISON (Gujarat Specific vs Historical Average):")
     print("="*70)
-    for crop in list(overlap)[:5]:
-        hist_avg = gujarat_records[
-            gujarat_records['crop'].str.strip().str.title() == crop
-        ]['yield'].mean()
-        
-        current = combined[
-            combined['Crop'].str.strip().str.title() == crop
-        ]['Yield'].values
-        
-        if len(current) > 0:
-            diff = current[0] - hist_avg
-            percent = (diff / hist_avg) * 100
-            arrow = "📈" if diff > 0 else "📉"
-            print(f"   {crop:20s}  Historical: {hist_avg:7.2f}  Current: {current[0]:7.2f}  "
-                  f"{arrow} {diff:+7.2f} ({percent:+.1f}%)")
+    for crop, hist, cur, diff, percent in examples.itertuples():
+        arrow = "📈" if diff > 0 else "📉"
+        print(f"   {crop:20s}  Historical: {hist:7.2f}  Current: {cur:7.2f}  "
+              f"{arrow} {diff:+7.2f} ({percent:+.1f}%)")
     
 except Exception as e:
     print(f"   Main dataset not found or error: {e}")
@@ -153,5 +153,11 @@ def test_all_features():
     print("=" * 80)
 
 
-if __name__ == '__main__':
+def main():
+    """Run the feature walkthrough; returns a process exit code."""
     test_all_features()
+    return 0
+
+
+if __name__ == '__main__':
+    main()